@@ -13,7 +13,7 @@ from stock_symbols_service import stock_symbols_service
 from enhanced_stock_service import enhanced_stock_service
 from options_analytics_service import OptionsAnalyticsService
 from news_service import NewsService
-from technical_analysis_service import TechnicalAnalysisService
+from technical_analysis_service import technical_analysis_service
 from fundamental_analysis_service import fundamental_service
 from alternative_data_service import alternative_data_service
 from database_service import database_service
@@ -52,7 +52,8 @@ dark_pool_scanner = DarkPoolScanner()
 # Initialize services
 options_service = OptionsAnalyticsService()
 news_service = NewsService()
-technical_service = TechnicalAnalysisService()
+# The module's shared instance, so one process has a single disk cache writer
+technical_service = technical_analysis_service
 
 @app.route('/')
 def index():
@@ -920,6 +921,23 @@ def get_technical_analysis(symbol):
         app.logger.error(f'Technical analysis error for {symbol}: {str(e)}')
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/technical/batch', methods=['POST'])
+def get_technical_analysis_batch():
+    """Get technical analysis for multiple stocks at once"""
+    try:
+        data = request.get_json()
+        symbols = data.get('symbols', [])
+        
+        if not symbols:
+            return jsonify({'error': 'Symbols list is required'}), 400
+        
+        results = technical_service.get_technical_analysis_batch([symbol.upper() for symbol in symbols])
+        return jsonify({'results': results})
+        
+    except Exception as e:
+        app.logger.error(f'Batch technical analysis error: {str(e)}')
+        return jsonify({'error': str(e)}), 500
+
 # Fundamental Analysis API Endpoint
 @app.route('/api/fundamental/<symbol>')
 def get_fundamental_analysis(symbol):
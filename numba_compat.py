@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Numba Compatibility
+Provides njit/prange, falling back to plain Python when numba is not installed
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Identity decorator used in place of numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
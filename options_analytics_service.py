@@ -7,13 +7,22 @@ Provides comprehensive options data analysis including Greeks, volatility, and f
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from typing import Dict, List, Optional
 from scipy.stats import norm
 import math
 import json
 
+@lru_cache(maxsize=512)
+def _days_to_expiry(expiration_str: str, today_iso: str) -> int:
+    """Calendar days from today until expiration, memoized per (expiration, day)"""
+    expiration_date = datetime.strptime(expiration_str, '%Y-%m-%d')
+    today = datetime.strptime(today_iso, '%Y-%m-%d')
+    return max(0, (expiration_date - today).days)
+
 class OptionsAnalyticsService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -42,9 +51,28 @@ class OptionsAnalyticsService:
             }
             
             # Process each expiration date (limit to first 6 for performance)
-            for expiration in expirations[:6]:
+            selected_expirations = list(expirations[:6])
+            
+            # Fetch the chains concurrently, each request is network bound
+            fetched_chains = {}
+            with ThreadPoolExecutor(max_workers=len(selected_expirations)) as executor:
+                futures = {
+                    executor.submit(ticker.option_chain, expiration): expiration
+                    for expiration in selected_expirations
+                }
+                for future in as_completed(futures):
+                    expiration = futures[future]
+                    try:
+                        fetched_chains[expiration] = future.result()
+                    except Exception as e:
+                        self.logger.error(f'Error fetching expiration {expiration}: {str(e)}')
+            
+            for expiration in selected_expirations:
+                if expiration not in fetched_chains:
+                    continue
+                
                 try:
-                    chain = ticker.option_chain(expiration)
+                    chain = fetched_chains[expiration]
                     calls = chain.calls
                     puts = chain.puts
                     
@@ -53,8 +81,8 @@ class OptionsAnalyticsService:
                     puts_enhanced = self._enhance_options_data(puts, current_price, expiration, 'put')
                     
                     # Convert to JSON-serializable format
-                    calls_records = self._convert_to_json_serializable(calls_enhanced.to_dict('records')) if not calls_enhanced.empty else []
-                    puts_records = self._convert_to_json_serializable(puts_enhanced.to_dict('records')) if not puts_enhanced.empty else []
+                    calls_records = self._dataframe_to_records(self._round_greeks(calls_enhanced))
+                    puts_records = self._dataframe_to_records(self._round_greeks(puts_enhanced))
                     
                     options_data['chains'][expiration] = {
                         'calls': calls_records,
@@ -96,31 +124,25 @@ class OptionsAnalyticsService:
             if 'impliedVolatility' not in enhanced_df.columns:
                 enhanced_df['impliedVolatility'] = 0.3  # Default IV
             
-            # Calculate Greeks
-            greeks = []
-            for _, row in enhanced_df.iterrows():
-                strike = row['strike']
-                iv = row.get('impliedVolatility', 0.3)
-                
-                if iv > 0 and time_to_expiry > 0:
-                    greek_values = self._calculate_greeks(
-                        current_price, strike, time_to_expiry, risk_free_rate, iv, option_type
-                    )
-                else:
-                    greek_values = {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-                
-                greeks.append(greek_values)
-            
-            # Add Greeks to dataframe
-            greeks_df = pd.DataFrame(greeks)
-            enhanced_df = pd.concat([enhanced_df, greeks_df], axis=1)
+            # Calculate Greeks for the whole chain at once
+            greeks = self._calculate_greeks(
+                current_price,
+                enhanced_df['strike'].to_numpy(dtype=float),
+                time_to_expiry,
+                risk_free_rate,
+                enhanced_df['impliedVolatility'].to_numpy(dtype=float),
+                option_type
+            )
+            # Greeks are display precision, float32 halves the bytes carried to serialization
+            for greek, values in greeks.items():
+                enhanced_df[greek] = values.astype(np.float32)
             
             # Calculate additional metrics
             enhanced_df['moneyness'] = enhanced_df['strike'] / current_price
-            enhanced_df['intrinsic_value'] = enhanced_df.apply(
-                lambda row: max(0, current_price - row['strike']) if option_type == 'call' 
-                else max(0, row['strike'] - current_price), axis=1
-            )
+            if option_type == 'call':
+                enhanced_df['intrinsic_value'] = np.maximum(0, current_price - enhanced_df['strike'])
+            else:
+                enhanced_df['intrinsic_value'] = np.maximum(0, enhanced_df['strike'] - current_price)
             enhanced_df['time_value'] = enhanced_df['lastPrice'] - enhanced_df['intrinsic_value']
             enhanced_df['days_to_expiry'] = days_to_expiry
             
@@ -134,47 +156,71 @@ class OptionsAnalyticsService:
             self.logger.error(f'Error enhancing options data: {str(e)}')
             return options_df
     
-    def _calculate_greeks(self, S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> Dict:
-        """Calculate Black-Scholes Greeks"""
+    def _calculate_greeks(self, S: float, K: np.ndarray, T: float, r: float, sigma: np.ndarray, option_type: str) -> Dict:
+        """Calculate Black-Scholes Greeks for arrays of strikes and volatilities sharing one expiration"""
+        K = np.asarray(K, dtype=float)
+        sigma = np.asarray(sigma, dtype=float)
+        zeros = np.zeros(np.broadcast(K, sigma).shape)
+        
         try:
-            if T <= 0 or sigma <= 0:
-                return {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
+            if T <= 0 or S <= 0:
+                return {greek: zeros.copy() for greek in ('delta', 'gamma', 'theta', 'vega', 'rho')}
             
-            d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-            d2 = d1 - sigma * np.sqrt(T)
+            # Contracts without a usable volatility or strike get zero Greeks
+            valid = (sigma > 0) & (K > 0)
+            sigma = np.where(valid, sigma, 1.0)
+            K = np.where(valid, K, 1.0)
+            
+            # Invariants shared by every strike on this expiration
+            log_S = math.log(S)
+            sqrt_T = math.sqrt(T)
+            discount = math.exp(-r * T)
+            
+            sigma_sqrt_T = sigma * sqrt_T
+            d1 = (log_S - np.log(K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+            d2 = d1 - sigma_sqrt_T
+            pdf_d1 = norm.pdf(d1)
             
             if option_type == 'call':
                 delta = norm.cdf(d1)
-                rho = K * T * np.exp(-r * T) * norm.cdf(d2) / 100
-                theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) - 
-                        r * K * np.exp(-r * T) * norm.cdf(d2)) / 365
+                cdf_d2 = norm.cdf(d2)
+                rho = K * T * discount * cdf_d2 / 100
+                theta = (-S * pdf_d1 * sigma / (2 * sqrt_T) - 
+                        r * K * discount * cdf_d2) / 365
             else:  # put
                 delta = -norm.cdf(-d1)
-                rho = -K * T * np.exp(-r * T) * norm.cdf(-d2) / 100
-                theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) + 
-                        r * K * np.exp(-r * T) * norm.cdf(-d2)) / 365
+                cdf_d2 = norm.cdf(-d2)
+                rho = -K * T * discount * cdf_d2 / 100
+                theta = (-S * pdf_d1 * sigma / (2 * sqrt_T) + 
+                        r * K * discount * cdf_d2) / 365
             
-            gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-            vega = S * norm.pdf(d1) * np.sqrt(T) / 100
+            gamma = pdf_d1 / (S * sigma_sqrt_T)
+            vega = S * pdf_d1 * sqrt_T / 100
             
             return {
-                'delta': round(delta, 4),
-                'gamma': round(gamma, 4),
-                'theta': round(theta, 4),
-                'vega': round(vega, 4),
-                'rho': round(rho, 4)
+                'delta': np.where(valid, delta, 0.0),
+                'gamma': np.where(valid, gamma, 0.0),
+                'theta': np.where(valid, theta, 0.0),
+                'vega': np.where(valid, vega, 0.0),
+                'rho': np.where(valid, rho, 0.0)
             }
             
         except Exception as e:
             self.logger.error(f'Error calculating Greeks: {str(e)}')
-            return {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
+            return {greek: zeros.copy() for greek in ('delta', 'gamma', 'theta', 'vega', 'rho')}
+    
+    def _round_greeks(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Round Greek columns for display once the chain math is done"""
+        greek_columns = [c for c in ('delta', 'gamma', 'theta', 'vega', 'rho') if c in df.columns]
+        if greek_columns:
+            # Widen float32 storage first so rounded values serialize as clean decimals
+            df[greek_columns] = df[greek_columns].astype(np.float64).round(4)
+        return df
     
     def _calculate_days_to_expiry(self, expiration_str: str) -> int:
         """Calculate days to expiration"""
         try:
-            expiration_date = datetime.strptime(expiration_str, '%Y-%m-%d')
-            today = datetime.now()
-            return max(0, (expiration_date - today).days)
+            return _days_to_expiry(expiration_str, date.today().isoformat())
         except:
             return 0
     
@@ -215,15 +261,11 @@ class OptionsAnalyticsService:
                 all_calls.extend(chain_data['calls'])
                 all_puts.extend(chain_data['puts'])
             
-            if all_calls:
-                calls_df = pd.DataFrame(all_calls)
-                analytics['total_call_volume'] = calls_df['volume'].fillna(0).sum()
-                analytics['total_call_oi'] = calls_df['openInterest'].fillna(0).sum()
-            
-            if all_puts:
-                puts_df = pd.DataFrame(all_puts)
-                analytics['total_put_volume'] = puts_df['volume'].fillna(0).sum()
-                analytics['total_put_oi'] = puts_df['openInterest'].fillna(0).sum()
+            # Records already hold None for missing values, so plain sums are enough
+            analytics['total_call_volume'] = sum((c.get('volume') or 0) for c in all_calls)
+            analytics['total_call_oi'] = sum((c.get('openInterest') or 0) for c in all_calls)
+            analytics['total_put_volume'] = sum((p.get('volume') or 0) for p in all_puts)
+            analytics['total_put_oi'] = sum((p.get('openInterest') or 0) for p in all_puts)
             
             # Calculate put/call ratio
             if analytics['total_call_volume'] > 0:
@@ -298,41 +340,27 @@ class OptionsAnalyticsService:
     def _find_most_active_strikes(self, calls: List, puts: List) -> List:
         """Find most active option strikes by volume"""
         try:
-            strike_activity = {}
+            if not calls and not puts:
+                return []
             
-            # Aggregate call activity
-            for call in calls:
-                strike = call.get('strike')
-                volume = call.get('volume', 0)
-                if strike is not None and volume is not None:
-                    if strike not in strike_activity:
-                        strike_activity[strike] = {'volume': 0, 'type': 'mixed'}
-                    strike_activity[strike]['volume'] += volume
-            
-            # Aggregate put activity
-            for put in puts:
-                strike = put.get('strike')
-                volume = put.get('volume', 0)
-                if strike is not None and volume is not None:
-                    if strike not in strike_activity:
-                        strike_activity[strike] = {'volume': 0, 'type': 'mixed'}
-                    strike_activity[strike]['volume'] += volume
+            # Aggregate call and put activity per strike in a single groupby
+            combined = pd.concat([pd.DataFrame(calls), pd.DataFrame(puts)], ignore_index=True)
+            if 'strike' not in combined.columns or 'volume' not in combined.columns:
+                return []
+            
+            combined = combined.dropna(subset=['strike', 'volume'])
+            if combined.empty:
+                return []
             
             # Sort by volume and return top 10
-            sorted_strikes = sorted(
-                strike_activity.items(), 
-                key=lambda x: x[1]['volume'], 
-                reverse=True
-            )[:10]
-            
-            return [
-                {
-                    'strike': strike,
-                    'volume': data['volume'],
-                    'type': data['type']
-                }
-                for strike, data in sorted_strikes
-            ]
+            strike_activity = (
+                combined.groupby('strike', as_index=False)['volume']
+                .sum()
+                .nlargest(10, 'volume')
+            )
+            strike_activity['type'] = 'mixed'
+            
+            return strike_activity.to_dict('records')
             
         except Exception as e:
             self.logger.error(f'Error finding most active strikes: {str(e)}')
@@ -392,22 +420,25 @@ class OptionsAnalyticsService:
             self.logger.error(f'Error detecting unusual activity: {str(e)}')
             return []
     
+    def _dataframe_to_records(self, df: pd.DataFrame) -> List:
+        """Convert a DataFrame to JSON-serializable records in one vectorized pass"""
+        if df.empty:
+            return []
+        
+        # Casting to object boxes numpy scalars as native Python types, NaN becomes None
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+    
     def _convert_to_json_serializable(self, data):
-        """Convert numpy/pandas data types to JSON-serializable types"""
-        if isinstance(data, list):
-            return [self._convert_to_json_serializable(item) for item in data]
-        elif isinstance(data, dict):
+        """Convert numpy data types and NaN to JSON-serializable types"""
+        if isinstance(data, dict):
             return {key: self._convert_to_json_serializable(value) for key, value in data.items()}
-        elif isinstance(data, (np.integer, np.int64, np.int32)):
-            return int(data)
-        elif isinstance(data, (np.floating, np.float64, np.float32)):
-            return float(data)
-        elif pd.isna(data) or data is None:
+        if isinstance(data, (list, tuple)):
+            return [self._convert_to_json_serializable(item) for item in data]
+        if isinstance(data, np.generic):  # Handle numpy scalars
+            data = data.item()
+        if isinstance(data, float) and math.isnan(data):
             return None
-        elif hasattr(data, 'item'):  # Handle numpy scalars
-            return data.item()
-        else:
-            return data
+        return data
 
 # Global instance
 options_analytics_service = OptionsAnalyticsService()
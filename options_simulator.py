@@ -7,10 +7,20 @@ Advanced options position simulator with P&L tracking and Greeks analysis
 import yfinance as yf
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from collections import defaultdict
+from functools import lru_cache
 from typing import List, Dict, Optional
 from scipy.stats import norm
 import math
+import time
+
+@lru_cache(maxsize=512)
+def _days_until(expiration_str, today_iso):
+    """Calendar days from today until expiration, memoized per (expiration, day)"""
+    exp_date = datetime.strptime(expiration_str, '%Y-%m-%d')
+    today = datetime.strptime(today_iso, '%Y-%m-%d')
+    return (exp_date - today).days
 
 class OptionsSimulator:
     def __init__(self):
@@ -18,6 +28,10 @@ class OptionsSimulator:
         self.positions = []
         self.risk_free_rate = 0.05
         self.position_id = 1
+        self._ticker_cache = {}
+        self._info_cache = {}
+        self.info_cache_duration = 30  # seconds
+        self._rebuild_position_arrays()
     
     def calculate_option_price(self, S, K, T, r, sigma, option_type='call'):
         """Calculate theoretical option price using Black-Scholes"""
@@ -67,20 +81,86 @@ class OptionsSimulator:
             vega = S*norm.pdf(d1)*np.sqrt(T) / 100
             
             return {
-                'delta': round(delta, 4),
-                'gamma': round(gamma, 4),
-                'theta': round(theta, 4),
-                'rho': round(rho, 4),
-                'vega': round(vega, 4)
+                'delta': delta,
+                'gamma': gamma,
+                'theta': theta,
+                'rho': rho,
+                'vega': vega
             }
         except:
             return {'delta': 0, 'gamma': 0, 'theta': 0, 'rho': 0, 'vega': 0}
     
+    def calculate_prices_and_greeks(self, S, K, T, r, sigma, is_call):
+        """Calculate Black-Scholes prices and Greeks for arrays of options in one pass"""
+        S = np.asarray(S, dtype=float)
+        K = np.asarray(K, dtype=float)
+        T = np.asarray(T, dtype=float)
+        sigma = np.asarray(sigma, dtype=float)
+        sign = np.where(np.asarray(is_call, dtype=bool), 1.0, -1.0)
+        
+        # Same edge cases as the scalar functions: intrinsic value at expiration,
+        # minimum volatility for pricing and zero Greeks without time or volatility
+        live = T > 0
+        has_greeks = live & (sigma > 0)
+        T_live = np.where(live, T, 1.0)
+        sigma_live = np.where(sigma > 0, sigma, 0.01)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sqrt_T = np.sqrt(T_live)
+            discount = np.exp(-r * T_live)
+            sigma_sqrt_T = sigma_live * sqrt_T
+            d1 = (np.log(S / K) + (r + 0.5 * sigma_live**2) * T_live) / sigma_sqrt_T
+            d2 = d1 - sigma_sqrt_T
+            pdf_d1 = norm.pdf(d1)
+            cdf_d1 = norm.cdf(sign * d1)
+            cdf_d2 = norm.cdf(sign * d2)
+            
+            price = sign * (S * cdf_d1 - K * discount * cdf_d2)
+            intrinsic = np.maximum(sign * (S - K), 0)
+            price = np.where(live, np.maximum(price, 0.01), intrinsic)
+            price = np.where(np.isfinite(price), price, 0.01)
+            
+            delta = np.where(sign > 0, cdf_d1, -cdf_d1)
+            rho = sign * K * T_live * discount * cdf_d2 / 100
+            theta = (-S * pdf_d1 * sigma_live / (2 * sqrt_T) - sign * r * K * discount * cdf_d2) / 365
+            gamma = pdf_d1 / (S * sigma_sqrt_T)
+            vega = S * pdf_d1 * sqrt_T / 100
+        
+        greeks = {
+            'delta': delta,
+            'gamma': gamma,
+            'theta': theta,
+            'rho': rho,
+            'vega': vega
+        }
+        for greek, values in greeks.items():
+            greeks[greek] = np.where(has_greeks & np.isfinite(values), values, 0.0)
+        
+        return price, greeks
+    
+    def _get_ticker(self, symbol):
+        """Get a reusable yfinance Ticker for a symbol"""
+        ticker = self._ticker_cache.get(symbol)
+        if ticker is None:
+            ticker = yf.Ticker(symbol)
+            self._ticker_cache[symbol] = ticker
+        return ticker
+    
+    def _get_info(self, symbol):
+        """Get ticker info, cached for a short time to avoid repeated quote fetches"""
+        if symbol in self._info_cache:
+            cache_time, info = self._info_cache[symbol]
+            if time.time() - cache_time < self.info_cache_duration:
+                return info
+        
+        info = self._get_ticker(symbol).info
+        self._info_cache[symbol] = (time.time(), info)
+        return info
+    
     def get_current_stock_price(self, symbol):
         """Get current stock price from Yahoo Finance"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = self._get_info(symbol)
             return info.get('currentPrice', info.get('regularMarketPrice', 100))
         except:
             return 100  # Default price if unable to fetch
@@ -88,18 +168,24 @@ class OptionsSimulator:
     def get_implied_volatility(self, symbol, strike, expiration, option_type):
         """Get implied volatility from market data"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._get_ticker(symbol)
             chain = ticker.option_chain(expiration)
-            
+            return self._lookup_implied_volatility(chain, strike, option_type)
+        except:
+            return 0.25  # Default IV
+    
+    def _lookup_implied_volatility(self, chain, strike, option_type):
+        """Find implied volatility for a strike in an already fetched option chain"""
+        try:
             if option_type.lower() == 'call':
                 options = chain.calls
             else:
                 options = chain.puts
             
             # Find matching strike
-            matching = options[options['strike'] == strike]
+            matching = options.loc[options['strike'] == strike, 'impliedVolatility']
             if not matching.empty:
-                iv = matching.iloc[0]['impliedVolatility']
+                iv = matching.iat[0]
                 return iv if iv > 0 else 0.25
             
             return 0.25  # Default IV
@@ -113,8 +199,7 @@ class OptionsSimulator:
             current_price = self.get_current_stock_price(symbol)
             
             # Calculate time to expiration
-            exp_date = datetime.strptime(expiration, '%Y-%m-%d')
-            time_to_exp = (exp_date - datetime.now()).days / 365.0
+            time_to_exp = _days_until(expiration, date.today().isoformat()) / 365.0
             
             # Get implied volatility
             iv = self.get_implied_volatility(symbol, strike, expiration, option_type)
@@ -149,6 +234,7 @@ class OptionsSimulator:
             
             self.positions.append(position)
             self.position_id += 1
+            self._rebuild_position_arrays()
             
             return position
             
@@ -157,50 +243,71 @@ class OptionsSimulator:
     
     def update_positions(self):
         """Update all positions with current market data"""
+        # Group open positions so each symbol/expiration is only fetched once
+        by_key = defaultdict(list)
         for position in self.positions:
             if position['status'] == 'CLOSED':
                 continue
-                
+            by_key[(position['symbol'], position['expiration'])].append(position)
+        
+        # Refresh quotes once per update, then reuse them for every position
+        self._info_cache.clear()
+        
+        today_iso = date.today().isoformat()
+        batch = []
+        for (symbol, expiration), positions in by_key.items():
+            # Get current stock price
+            current_price = self.get_current_stock_price(symbol)
+            
+            # Get the option chain once for every strike on this expiration
             try:
-                # Get current stock price
-                current_price = self.get_current_stock_price(position['symbol'])
-                
-                # Calculate time to expiration
-                exp_date = datetime.strptime(position['expiration'], '%Y-%m-%d')
-                time_to_exp = max((exp_date - datetime.now()).days / 365.0, 0)
-                
+                chain = self._get_ticker(symbol).option_chain(expiration)
+            except:
+                chain = None
+            
+            # Calculate time to expiration
+            time_to_exp = max(_days_until(expiration, today_iso) / 365.0, 0)
+            
+            for position in positions:
                 # Get current implied volatility
-                iv = self.get_implied_volatility(
-                    position['symbol'], position['strike'], 
-                    position['expiration'], position['type']
-                )
-                
-                # Calculate current option price
-                current_option_price = self.calculate_option_price(
-                    current_price, position['strike'], time_to_exp, 
-                    self.risk_free_rate, iv, position['type']
-                )
-                
-                # Calculate current Greeks
-                greeks = self.calculate_greeks(
-                    current_price, position['strike'], time_to_exp, 
-                    self.risk_free_rate, iv, position['type']
-                )
-                
-                # Update position
-                position.update({
-                    'current_stock_price': current_price,
-                    'current_option_price': current_option_price,
-                    'implied_volatility': iv,
-                    'time_to_expiration': time_to_exp,
-                    'greeks': greeks,
-                    'current_value': current_option_price * position['quantity'] * 100,
-                    'unrealized_pnl': (current_option_price - position['entry_price']) * position['quantity'] * 100,
-                    'pnl_percentage': ((current_option_price - position['entry_price']) / position['entry_price']) * 100 if position['entry_price'] > 0 else 0
-                })
+                if chain is not None:
+                    iv = self._lookup_implied_volatility(chain, position['strike'], position['type'])
+                else:
+                    iv = 0.25  # Default IV
                 
-            except Exception as e:
-                print(f"Error updating position {position['id']}: {str(e)}")
+                batch.append((position, current_price, time_to_exp, iv))
+        
+        if batch:
+            # Reprice the whole portfolio with one vectorized Black-Scholes pass
+            prices, greeks = self.calculate_prices_and_greeks(
+                [item[1] for item in batch],
+                [item[0]['strike'] for item in batch],
+                [item[2] for item in batch],
+                self.risk_free_rate,
+                [item[3] for item in batch],
+                [item[0]['type'].lower() == 'call' for item in batch]
+            )
+            
+            for i, (position, current_price, time_to_exp, iv) in enumerate(batch):
+                try:
+                    current_option_price = float(prices[i])
+                    
+                    # Update position
+                    position.update({
+                        'current_stock_price': current_price,
+                        'current_option_price': current_option_price,
+                        'implied_volatility': iv,
+                        'time_to_expiration': time_to_exp,
+                        'greeks': {greek: float(values[i]) for greek, values in greeks.items()},
+                        'current_value': current_option_price * position['quantity'] * 100,
+                        'unrealized_pnl': (current_option_price - position['entry_price']) * position['quantity'] * 100,
+                        'pnl_percentage': ((current_option_price - position['entry_price']) / position['entry_price']) * 100 if position['entry_price'] > 0 else 0
+                    })
+                    
+                except Exception as e:
+                    print(f"Error updating position {position['id']}: {str(e)}")
+        
+        self._rebuild_position_arrays()
     
     def close_position(self, position_id, exit_price=None):
         """Close a position"""
@@ -217,34 +324,54 @@ class OptionsSimulator:
                     'realized_pnl': (exit_price - position['entry_price']) * position['quantity'] * 100,
                     'status': 'CLOSED'
                 })
+                self._rebuild_position_arrays()
                 
                 return position
         
         return None
     
+    def _rebuild_position_arrays(self):
+        """Rebuild the struct-of-arrays view of positions used for portfolio aggregation"""
+        positions = self.positions
+        
+        self._open_mask = np.array([p['status'] == 'OPEN' for p in positions], dtype=bool)
+        self._qty = np.array([p['quantity'] for p in positions], dtype=float)
+        self._cost_basis = np.array([p['cost_basis'] for p in positions], dtype=float)
+        self._current_value = np.array([p.get('current_value', 0) for p in positions], dtype=float)
+        self._unrealized_pnl = np.array([p.get('unrealized_pnl', 0) for p in positions], dtype=float)
+        self._realized_pnl = np.array([p.get('realized_pnl', 0) for p in positions], dtype=float)
+        
+        self._delta = np.array([p['greeks']['delta'] for p in positions], dtype=float)
+        self._gamma = np.array([p['greeks']['gamma'] for p in positions], dtype=float)
+        self._theta = np.array([p['greeks']['theta'] for p in positions], dtype=float)
+        self._vega = np.array([p['greeks']['vega'] for p in positions], dtype=float)
+    
     def get_portfolio_summary(self):
         """Get portfolio summary statistics"""
         self.update_positions()
         
-        open_positions = [p for p in self.positions if p['status'] == 'OPEN']
-        closed_positions = [p for p in self.positions if p['status'] == 'CLOSED']
+        open_mask = self._open_mask
+        closed_mask = ~open_mask
+        open_qty = self._qty[open_mask]
         
         # Calculate totals
-        total_cost_basis = sum(p['cost_basis'] for p in open_positions)
-        total_current_value = sum(p.get('current_value', 0) for p in open_positions)
-        total_unrealized_pnl = sum(p.get('unrealized_pnl', 0) for p in open_positions)
-        total_realized_pnl = sum(p.get('realized_pnl', 0) for p in closed_positions)
+        total_cost_basis = float(self._cost_basis[open_mask].sum())
+        total_current_value = float(self._current_value[open_mask].sum())
+        total_unrealized_pnl = float(self._unrealized_pnl[open_mask].sum())
+        total_realized_pnl = float(self._realized_pnl[closed_mask].sum())
         
         # Calculate portfolio Greeks
-        portfolio_delta = sum(p['greeks']['delta'] * p['quantity'] for p in open_positions)
-        portfolio_gamma = sum(p['greeks']['gamma'] * p['quantity'] for p in open_positions)
-        portfolio_theta = sum(p['greeks']['theta'] * p['quantity'] for p in open_positions)
-        portfolio_vega = sum(p['greeks']['vega'] * p['quantity'] for p in open_positions)
+        portfolio_delta = float(np.dot(self._delta[open_mask], open_qty))
+        portfolio_gamma = float(np.dot(self._gamma[open_mask], open_qty))
+        portfolio_theta = float(np.dot(self._theta[open_mask], open_qty))
+        portfolio_vega = float(np.dot(self._vega[open_mask], open_qty))
+        
+        open_positions = int(open_mask.sum())
         
         return {
             'total_positions': len(self.positions),
-            'open_positions': len(open_positions),
-            'closed_positions': len(closed_positions),
+            'open_positions': open_positions,
+            'closed_positions': len(self.positions) - open_positions,
             'total_cost_basis': total_cost_basis,
             'total_current_value': total_current_value,
             'total_unrealized_pnl': total_unrealized_pnl,
@@ -262,19 +389,23 @@ class OptionsSimulator:
         """Perform scenario analysis on portfolio"""
         scenarios = []
         
+        # Per-position invariants do not depend on the price shock
+        open_positions = []
+        for position in self.positions:
+            if position['status'] == 'CLOSED':
+                continue
+            
+            # Calculate new time to expiration
+            new_time_to_exp = max(position['time_to_expiration'] - (time_decay_days / 365), 0)
+            open_positions.append((position, new_time_to_exp, position['quantity'] * 100))
+        
         for price_change in stock_price_changes:
             scenario_pnl = 0
+            shock = 1 + price_change / 100
             
-            for position in self.positions:
-                if position['status'] == 'CLOSED':
-                    continue
-                
+            for position, new_time_to_exp, multiplier in open_positions:
                 # Calculate new stock price
-                current_price = position['current_stock_price']
-                new_price = current_price * (1 + price_change / 100)
-                
-                # Calculate new time to expiration
-                new_time_to_exp = max(position['time_to_expiration'] - (time_decay_days / 365), 0)
+                new_price = position['current_stock_price'] * shock
                 
                 # Calculate new option price
                 new_option_price = self.calculate_option_price(
@@ -283,7 +414,7 @@ class OptionsSimulator:
                 )
                 
                 # Calculate P&L for this position
-                position_pnl = (new_option_price - position['entry_price']) * position['quantity'] * 100
+                position_pnl = (new_option_price - position['entry_price']) * multiplier
                 scenario_pnl += position_pnl
             
             scenarios.append({
@@ -9,22 +9,23 @@ import os
 
 def install_requirements():
     """Install required packages for local data collection"""
+    # sqlite3 is built into Python
     packages = [
         'yfinance',
         'pandas',
         'numpy',
-        'schedule',
-        'sqlite3'  # Built into Python
+        'schedule'
     ]
     
     print("📦 Installing required packages...")
-    for package in packages:
-        if package != 'sqlite3':  # sqlite3 is built-in
-            try:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-                print(f"✅ {package} installed")
-            except subprocess.CalledProcessError:
-                print(f"❌ Failed to install {package}")
+    try:
+        # One pip run resolves and downloads everything together
+        subprocess.check_call([
+            sys.executable, '-m', 'pip', 'install', '--upgrade', '--prefer-binary', *packages
+        ])
+        print(f"✅ {', '.join(packages)} installed")
+    except subprocess.CalledProcessError:
+        print(f"❌ Failed to install {', '.join(packages)}")
 
 def create_database():
     """Initialize the local database"""
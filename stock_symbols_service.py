@@ -6,142 +6,338 @@ Provides stock symbol validation and autocomplete suggestions
 
 import yfinance as yf
 import pandas as pd
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import re
+import sys
+import tempfile
+import time
+import atexit
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import islice
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import logging
 
+# Yahoo's quote endpoint accepts a comma separated list of symbols
+QUOTE_URL = 'https://query1.finance.yahoo.com/v7/finance/quote'
+QUOTE_BATCH_SIZE = 20
+
+# The quote endpoint rejects requests without a crumb tied to the session's Yahoo cookie
+COOKIE_URL = 'https://fc.yahoo.com'
+CRUMB_URL = 'https://query1.finance.yahoo.com/v1/test/getcrumb'
+
+# Validation results survive restarts so a cold start still has a warm cache
+VALIDATE_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'options-scanner', 'symbols.json')
+
+# Number of popular symbols fetched in the background at startup when
+# OPTIONS_SCANNER_PREWARM=1
+PREWARM_SYMBOL_COUNT = 30
+
+# Popular stocks with company names for autocomplete
+_POPULAR_SYMBOLS_SOURCE = {
+    # Tech Giants
+    'AAPL': 'Apple Inc.',
+    'MSFT': 'Microsoft Corporation',
+    'GOOGL': 'Alphabet Inc. Class A',
+    'GOOG': 'Alphabet Inc. Class C',
+    'AMZN': 'Amazon.com Inc.',
+    'META': 'Meta Platforms Inc.',
+    'TSLA': 'Tesla Inc.',
+    'NVDA': 'NVIDIA Corporation',
+    'NFLX': 'Netflix Inc.',
+    'CRM': 'Salesforce Inc.',
+    'ORCL': 'Oracle Corporation',
+    'ADBE': 'Adobe Inc.',
+    'INTC': 'Intel Corporation',
+    'AMD': 'Advanced Micro Devices Inc.',
+    'PYPL': 'PayPal Holdings Inc.',
+    'UBER': 'Uber Technologies Inc.',
+    'LYFT': 'Lyft Inc.',
+    'SNAP': 'Snap Inc.',
+    'TWTR': 'Twitter Inc.',
+    'SPOT': 'Spotify Technology S.A.',
+    
+    # Financial
+    'JPM': 'JPMorgan Chase & Co.',
+    'BAC': 'Bank of America Corporation',
+    'WFC': 'Wells Fargo & Company',
+    'GS': 'The Goldman Sachs Group Inc.',
+    'MS': 'Morgan Stanley',
+    'C': 'Citigroup Inc.',
+    'V': 'Visa Inc.',
+    'MA': 'Mastercard Incorporated',
+    'AXP': 'American Express Company',
+    'BRK.A': 'Berkshire Hathaway Inc. Class A',
+    'BRK.B': 'Berkshire Hathaway Inc. Class B',
+    
+    # Healthcare & Pharma
+    'JNJ': 'Johnson & Johnson',
+    'PFE': 'Pfizer Inc.',
+    'UNH': 'UnitedHealth Group Incorporated',
+    'MRNA': 'Moderna Inc.',
+    'BNTX': 'BioNTech SE',
+    'ABT': 'Abbott Laboratories',
+    'TMO': 'Thermo Fisher Scientific Inc.',
+    'DHR': 'Danaher Corporation',
+    'BMY': 'Bristol-Myers Squibb Company',
+    'AMGN': 'Amgen Inc.',
+    
+    # Consumer & Retail
+    'WMT': 'Walmart Inc.',
+    'HD': 'The Home Depot Inc.',
+    'PG': 'The Procter & Gamble Company',
+    'KO': 'The Coca-Cola Company',
+    'PEP': 'PepsiCo Inc.',
+    'MCD': 'McDonald\'s Corporation',
+    'SBUX': 'Starbucks Corporation',
+    'NKE': 'NIKE Inc.',
+    'DIS': 'The Walt Disney Company',
+    'COST': 'Costco Wholesale Corporation',
+    
+    # Energy & Utilities
+    'XOM': 'Exxon Mobil Corporation',
+    'CVX': 'Chevron Corporation',
+    'COP': 'ConocoPhillips',
+    'SLB': 'Schlumberger Limited',
+    'NEE': 'NextEra Energy Inc.',
+    'DUK': 'Duke Energy Corporation',
+    
+    # Industrial & Materials
+    'BA': 'The Boeing Company',
+    'CAT': 'Caterpillar Inc.',
+    'GE': 'General Electric Company',
+    'MMM': '3M Company',
+    'HON': 'Honeywell International Inc.',
+    'LMT': 'Lockheed Martin Corporation',
+    
+    # ETFs
+    'SPY': 'SPDR S&P 500 ETF Trust',
+    'QQQ': 'Invesco QQQ Trust',
+    'IWM': 'iShares Russell 2000 ETF',
+    'VTI': 'Vanguard Total Stock Market ETF',
+    'VOO': 'Vanguard S&P 500 ETF',
+    'VEA': 'Vanguard FTSE Developed Markets ETF',
+    'VWO': 'Vanguard FTSE Emerging Markets ETF',
+    'GLD': 'SPDR Gold Shares',
+    'SLV': 'iShares Silver Trust',
+    'TLT': 'iShares 20+ Year Treasury Bond ETF',
+    'HYG': 'iShares iBoxx $ High Yield Corporate Bond ETF',
+    'XLF': 'Financial Select Sector SPDR Fund',
+    'XLK': 'Technology Select Sector SPDR Fund',
+    'XLE': 'Energy Select Sector SPDR Fund',
+    'XLV': 'Health Care Select Sector SPDR Fund',
+    'XLI': 'Industrial Select Sector SPDR Fund',
+    'XLP': 'Consumer Staples Select Sector SPDR Fund',
+    'XLY': 'Consumer Discretionary Select Sector SPDR Fund',
+    'XLU': 'Utilities Select Sector SPDR Fund',
+    'XLB': 'Materials Select Sector SPDR Fund',
+    'XLRE': 'Real Estate Select Sector SPDR Fund',
+    
+    # Crypto-related
+    'COIN': 'Coinbase Global Inc.',
+    'MSTR': 'MicroStrategy Incorporated',
+    'SQ': 'Block Inc.',
+    'RIOT': 'Riot Platforms Inc.',
+    'MARA': 'Marathon Digital Holdings Inc.',
+    
+    # Meme Stocks & Popular Trading
+    'GME': 'GameStop Corp.',
+    'AMC': 'AMC Entertainment Holdings Inc.',
+    'BB': 'BlackBerry Limited',
+    'NOK': 'Nokia Corporation',
+    'PLTR': 'Palantir Technologies Inc.',
+    'WISH': 'ContextLogic Inc.',
+    'CLOV': 'Clover Health Investments Corp.',
+    'SPCE': 'Virgin Galactic Holdings Inc.',
+    'NIO': 'NIO Inc.',
+    'XPEV': 'XPeng Inc.',
+    'LI': 'Li Auto Inc.',
+    'RIVN': 'Rivian Automotive Inc.',
+    'LCID': 'Lucid Group Inc.',
+}
+
+# Frozen, shared by every service instance; symbols are interned since they
+# are compared and used as dict keys on every suggestion query
+_POPULAR_SYMBOLS = MappingProxyType({
+    sys.intern(symbol): name for symbol, name in _POPULAR_SYMBOLS_SOURCE.items()
+})
+_POPULAR_NAMES_UPPER = MappingProxyType({
+    symbol: name.upper() for symbol, name in _POPULAR_SYMBOLS.items()
+})
+del _POPULAR_SYMBOLS_SOURCE
+
+def _annualized_volatility(closes: np.ndarray) -> Optional[float]:
+    """Annualized volatility of daily close-to-close returns"""
+    closes = closes[~np.isnan(closes)]
+    if closes.size < 3:
+        return None
+    
+    returns = closes[1:] / closes[:-1] - 1.0
+    return float(returns.std(ddof=1) * np.sqrt(252))
+
 class StockSymbolsService:
+    __slots__ = (
+        'logger', 'symbols_cache', 'session', 'popular_symbols',
+        '_quote_lock', '_quote_crumb', '_quote_disabled',
+        '_cache_lock', '_validate_cache', '_info_cache', '_volatility_cache',
+        'validate_cache_duration', 'info_cache_duration', 'volatility_cache_duration',
+        'validate_cache_size', 'info_cache_size',
+        '_symbol_list_sorted', '_symbol_trie', '_name_row_starts', '_name_blob'
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.symbols_cache = {}
+        
+        # One keep-alive connection pool shared by quote requests and every yfinance
+        # Ticker, sized for the batch_validate worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        
+        # Crumb for the quote endpoint, fetched on first use; once Yahoo refuses it,
+        # validation goes straight to the yfinance info fallback
+        self._quote_lock = threading.Lock()
+        self._quote_crumb = None
+        self._quote_disabled = False
+        
+        # Bounded LRU caches of (timestamp, data) entries
+        self._cache_lock = threading.Lock()
+        self._validate_cache = OrderedDict()
+        self._info_cache = OrderedDict()
+        self._volatility_cache = OrderedDict()
+        self.validate_cache_duration = 3600  # 1 hour
+        self.info_cache_duration = 300  # 5 minutes
+        self.volatility_cache_duration = 60  # 1 minute
+        self.validate_cache_size = 4096
+        self.info_cache_size = 1024
+        self._load_validate_cache()
+        atexit.register(self._save_validate_cache)
+        
         self.load_popular_symbols()
+        self._build_search_indexes()
+        
+        if os.environ.get('OPTIONS_SCANNER_PREWARM') == '1':
+            threading.Thread(target=self._prewarm, daemon=True).start()
     
-    def load_popular_symbols(self):
-        """Load popular stock symbols for quick access"""
-        # Popular stocks with company names for autocomplete
-        self.popular_symbols = {
-            # Tech Giants
-            'AAPL': 'Apple Inc.',
-            'MSFT': 'Microsoft Corporation',
-            'GOOGL': 'Alphabet Inc. Class A',
-            'GOOG': 'Alphabet Inc. Class C',
-            'AMZN': 'Amazon.com Inc.',
-            'META': 'Meta Platforms Inc.',
-            'TSLA': 'Tesla Inc.',
-            'NVDA': 'NVIDIA Corporation',
-            'NFLX': 'Netflix Inc.',
-            'CRM': 'Salesforce Inc.',
-            'ORCL': 'Oracle Corporation',
-            'ADBE': 'Adobe Inc.',
-            'INTC': 'Intel Corporation',
-            'AMD': 'Advanced Micro Devices Inc.',
-            'PYPL': 'PayPal Holdings Inc.',
-            'UBER': 'Uber Technologies Inc.',
-            'LYFT': 'Lyft Inc.',
-            'SNAP': 'Snap Inc.',
-            'TWTR': 'Twitter Inc.',
-            'SPOT': 'Spotify Technology S.A.',
-            
-            # Financial
-            'JPM': 'JPMorgan Chase & Co.',
-            'BAC': 'Bank of America Corporation',
-            'WFC': 'Wells Fargo & Company',
-            'GS': 'The Goldman Sachs Group Inc.',
-            'MS': 'Morgan Stanley',
-            'C': 'Citigroup Inc.',
-            'V': 'Visa Inc.',
-            'MA': 'Mastercard Incorporated',
-            'AXP': 'American Express Company',
-            'BRK.A': 'Berkshire Hathaway Inc. Class A',
-            'BRK.B': 'Berkshire Hathaway Inc. Class B',
-            
-            # Healthcare & Pharma
-            'JNJ': 'Johnson & Johnson',
-            'PFE': 'Pfizer Inc.',
-            'UNH': 'UnitedHealth Group Incorporated',
-            'MRNA': 'Moderna Inc.',
-            'BNTX': 'BioNTech SE',
-            'ABT': 'Abbott Laboratories',
-            'TMO': 'Thermo Fisher Scientific Inc.',
-            'DHR': 'Danaher Corporation',
-            'BMY': 'Bristol-Myers Squibb Company',
-            'AMGN': 'Amgen Inc.',
-            
-            # Consumer & Retail
-            'WMT': 'Walmart Inc.',
-            'HD': 'The Home Depot Inc.',
-            'PG': 'The Procter & Gamble Company',
-            'KO': 'The Coca-Cola Company',
-            'PEP': 'PepsiCo Inc.',
-            'MCD': 'McDonald\'s Corporation',
-            'SBUX': 'Starbucks Corporation',
-            'NKE': 'NIKE Inc.',
-            'DIS': 'The Walt Disney Company',
-            'COST': 'Costco Wholesale Corporation',
-            
-            # Energy & Utilities
-            'XOM': 'Exxon Mobil Corporation',
-            'CVX': 'Chevron Corporation',
-            'COP': 'ConocoPhillips',
-            'SLB': 'Schlumberger Limited',
-            'NEE': 'NextEra Energy Inc.',
-            'DUK': 'Duke Energy Corporation',
-            
-            # Industrial & Materials
-            'BA': 'The Boeing Company',
-            'CAT': 'Caterpillar Inc.',
-            'GE': 'General Electric Company',
-            'MMM': '3M Company',
-            'HON': 'Honeywell International Inc.',
-            'LMT': 'Lockheed Martin Corporation',
-            
-            # ETFs
-            'SPY': 'SPDR S&P 500 ETF Trust',
-            'QQQ': 'Invesco QQQ Trust',
-            'IWM': 'iShares Russell 2000 ETF',
-            'VTI': 'Vanguard Total Stock Market ETF',
-            'VOO': 'Vanguard S&P 500 ETF',
-            'VEA': 'Vanguard FTSE Developed Markets ETF',
-            'VWO': 'Vanguard FTSE Emerging Markets ETF',
-            'GLD': 'SPDR Gold Shares',
-            'SLV': 'iShares Silver Trust',
-            'TLT': 'iShares 20+ Year Treasury Bond ETF',
-            'HYG': 'iShares iBoxx $ High Yield Corporate Bond ETF',
-            'XLF': 'Financial Select Sector SPDR Fund',
-            'XLK': 'Technology Select Sector SPDR Fund',
-            'XLE': 'Energy Select Sector SPDR Fund',
-            'XLV': 'Health Care Select Sector SPDR Fund',
-            'XLI': 'Industrial Select Sector SPDR Fund',
-            'XLP': 'Consumer Staples Select Sector SPDR Fund',
-            'XLY': 'Consumer Discretionary Select Sector SPDR Fund',
-            'XLU': 'Utilities Select Sector SPDR Fund',
-            'XLB': 'Materials Select Sector SPDR Fund',
-            'XLRE': 'Real Estate Select Sector SPDR Fund',
+    def _prewarm(self):
+        """Fetch info for the most popular symbols so first requests hit a warm cache"""
+        symbols = list(self.popular_symbols)[:PREWARM_SYMBOL_COUNT]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(self.get_symbol_info, symbols))
+        self.logger.info(f'Prewarmed symbol info cache for {len(symbols)} symbols')
+    
+    def _get_cached(self, cache: OrderedDict, key: str, duration: int):
+        """Get cached data if still valid, marking it as recently used"""
+        with self._cache_lock:
+            if key not in cache:
+                return None
             
-            # Crypto-related
-            'COIN': 'Coinbase Global Inc.',
-            'MSTR': 'MicroStrategy Incorporated',
-            'SQ': 'Block Inc.',
-            'RIOT': 'Riot Platforms Inc.',
-            'MARA': 'Marathon Digital Holdings Inc.',
+            cache_time, data = cache[key]
+            if time.time() - cache_time >= duration:
+                del cache[key]
+                return None
             
-            # Meme Stocks & Popular Trading
-            'GME': 'GameStop Corp.',
-            'AMC': 'AMC Entertainment Holdings Inc.',
-            'BB': 'BlackBerry Limited',
-            'NOK': 'Nokia Corporation',
-            'PLTR': 'Palantir Technologies Inc.',
-            'WISH': 'ContextLogic Inc.',
-            'CLOV': 'Clover Health Investments Corp.',
-            'SPCE': 'Virgin Galactic Holdings Inc.',
-            'NIO': 'NIO Inc.',
-            'XPEV': 'XPeng Inc.',
-            'LI': 'Li Auto Inc.',
-            'RIVN': 'Rivian Automotive Inc.',
-            'LCID': 'Lucid Group Inc.',
+            cache.move_to_end(key)
+            return data
+    
+    def _set_cached(self, cache: OrderedDict, key: str, data, max_size: int):
+        """Cache data, evicting the least recently used entries beyond max_size"""
+        with self._cache_lock:
+            cache[key] = (time.time(), data)
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+    
+    def _cache_validation(self, symbol: str, result: Dict):
+        """Cache a validation result unless it came from a transient error"""
+        if result.get('valid') or result.get('error') == 'Symbol not found':
+            self._set_cached(self._validate_cache, symbol, result, self.validate_cache_size)
+    
+    def _read_validate_cache_file(self) -> Dict:
+        """Read unexpired validation results saved by a previous run"""
+        try:
+            with open(VALIDATE_CACHE_FILE) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f'Could not load symbol validation cache: {str(e)}')
+            return {}
+        
+        now = time.time()
+        return {
+            symbol: (cache_time, result)
+            for symbol, (cache_time, result) in entries.items()
+            if now - cache_time < self.validate_cache_duration
         }
     
+    def _load_validate_cache(self):
+        """Load validation results saved by a previous run"""
+        entries = sorted(self._read_validate_cache_file().items(), key=lambda item: item[1][0])
+        self._validate_cache.update(entries[-self.validate_cache_size:])
+    
+    def _save_validate_cache(self):
+        """Persist validation results for the next run, keeping the newest entry per symbol"""
+        try:
+            entries = self._read_validate_cache_file()
+            with self._cache_lock:
+                for symbol, entry in self._validate_cache.items():
+                    if symbol not in entries or entries[symbol][0] < entry[0]:
+                        entries[symbol] = entry
+            
+            # Every worker saves at exit, so write a private temp file and rename it into
+            # place; readers then see either the old file or the new one, never a partial one
+            cache_dir = os.path.dirname(VALIDATE_CACHE_FILE)
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(temp_path, VALIDATE_CACHE_FILE)
+            except Exception:
+                os.unlink(temp_path)
+                raise
+        except Exception as e:
+            self.logger.warning(f'Could not save symbol validation cache: {str(e)}')
+    
+    def load_popular_symbols(self):
+        """Load popular stock symbols for quick access"""
+        # Shared read-only table, built once at import
+        self.popular_symbols = _POPULAR_SYMBOLS
+    
+    def _build_search_indexes(self):
+        """Build the symbol prefix trie and company name blob for get_suggestions"""
+        self._symbol_list_sorted = sorted(self.popular_symbols)
+        
+        # Each trie node keeps the sorted symbols under its prefix in the '' slot
+        self._symbol_trie = {}
+        for symbol in self._symbol_list_sorted:
+            node = self._symbol_trie
+            for char in symbol:
+                node = node.setdefault(char, {})
+                node.setdefault('', []).append(symbol)
+        
+        # All company names in one newline separated blob so a single regex
+        # scan finds every name containing the query
+        self._name_row_starts = []
+        offset = 0
+        for symbol in self._symbol_list_sorted:
+            self._name_row_starts.append(offset)
+            offset += len(_POPULAR_NAMES_UPPER[symbol]) + 1
+        self._name_blob = '\n'.join(_POPULAR_NAMES_UPPER[symbol] for symbol in self._symbol_list_sorted)
+    
     def validate_symbol(self, symbol: str) -> Dict:
         """Validate if a stock symbol exists and get basic info"""
         try:
@@ -156,28 +352,19 @@ class StockSymbolsService:
                     'source': 'cache'
                 }
             
-            # Try to fetch from Yahoo Finance
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            cached = self._get_cached(self._validate_cache, symbol, self.validate_cache_duration)
+            if cached is not None:
+                return cached
             
-            # Check if we got valid data
-            if info and ('longName' in info or 'shortName' in info):
-                company_name = info.get('longName', info.get('shortName', symbol))
-                return {
-                    'valid': True,
-                    'symbol': symbol,
-                    'name': company_name,
-                    'sector': info.get('sector', ''),
-                    'industry': info.get('industry', ''),
-                    'market_cap': info.get('marketCap', 0),
-                    'source': 'yfinance'
-                }
+            # Try the lightweight quote endpoint, then the full yfinance profile
+            quotes = self._batch_quote([symbol])
+            if symbol in quotes:
+                result = self._build_validation_result(symbol, quotes[symbol])
             else:
-                return {
-                    'valid': False,
-                    'symbol': symbol,
-                    'error': 'Symbol not found'
-                }
+                result = self._validate_with_info(symbol)
+            
+            self._cache_validation(symbol, result)
+            return result
                 
         except Exception as e:
             self.logger.error(f'Error validating symbol {symbol}: {str(e)}')
@@ -187,11 +374,104 @@ class StockSymbolsService:
                 'error': str(e)
             }
     
+    def _validate_with_info(self, symbol: str) -> Dict:
+        """Validate a symbol using the full yfinance info profile"""
+        try:
+            ticker = yf.Ticker(symbol, session=self.session)
+            return self._build_validation_result(symbol, ticker.info)
+        except Exception as e:
+            self.logger.error(f'Error validating symbol {symbol}: {str(e)}')
+            return {
+                'valid': False,
+                'symbol': symbol,
+                'error': str(e)
+            }
+    
+    def _build_validation_result(self, symbol: str, info: Optional[Dict]) -> Dict:
+        """Build a validation result from a quote or info dict"""
+        # Check if we got valid data
+        if info and ('longName' in info or 'shortName' in info):
+            company_name = info.get('longName', info.get('shortName', symbol))
+            return {
+                'valid': True,
+                'symbol': symbol,
+                'name': company_name,
+                'sector': info.get('sector', ''),
+                'industry': info.get('industry', ''),
+                'market_cap': info.get('marketCap', 0),
+                'source': 'yfinance'
+            }
+        
+        return {
+            'valid': False,
+            'symbol': symbol,
+            'error': 'Symbol not found'
+        }
+    
+    def _batch_quote(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch quotes for many symbols, QUOTE_BATCH_SIZE symbols per request
+        
+        Symbols the endpoint does not know map to None. Symbols whose request
+        failed are left out so callers can fall back to yfinance.
+        """
+        quotes = {}
+        crumb = self._get_quote_crumb()
+        if crumb is None:
+            return quotes
+        
+        for start in range(0, len(symbols), QUOTE_BATCH_SIZE):
+            chunk = symbols[start:start + QUOTE_BATCH_SIZE]
+            try:
+                response = self.session.get(QUOTE_URL, params={'symbols': ','.join(chunk), 'crumb': crumb}, timeout=10)
+                if response.status_code in (401, 403):
+                    # Every later request would be refused the same way
+                    self.logger.warning(f'Quote endpoint refused access ({response.status_code}), '
+                                        'validating with yfinance info from now on')
+                    self._quote_disabled = True
+                    break
+                response.raise_for_status()
+                results = response.json().get('quoteResponse', {}).get('result') or []
+            except Exception as e:
+                self.logger.warning(f'Quote request failed for {chunk}: {str(e)}')
+                continue
+            
+            found = {quote.get('symbol', '').upper(): quote for quote in results}
+            for symbol in chunk:
+                quotes[symbol] = found.get(symbol)
+        
+        return quotes
+    
+    def _get_quote_crumb(self) -> Optional[str]:
+        """Crumb for the quote endpoint, or None when it can't be used"""
+        with self._quote_lock:
+            if self._quote_disabled:
+                return None
+            if self._quote_crumb is not None:
+                return self._quote_crumb
+            
+            try:
+                # Any fc.yahoo.com response, even an error page, sets the cookie
+                self.session.get(COOKIE_URL, timeout=10)
+                response = self.session.get(CRUMB_URL, timeout=10)
+            except Exception as e:
+                # Network trouble may pass, so try again on the next call
+                self.logger.warning(f'Could not fetch quote crumb: {str(e)}')
+                return None
+            
+            crumb = response.text.strip() if response.ok else ''
+            if not crumb or '<' in crumb:
+                self.logger.warning(f'No quote crumb available ({response.status_code}), '
+                                    'validating with yfinance info from now on')
+                self._quote_disabled = True
+                return None
+            
+            self._quote_crumb = crumb
+            return crumb
+    
     def get_suggestions(self, query: str, limit: int = 10) -> List[Dict]:
         """Get stock symbol suggestions based on query"""
         try:
             query = query.upper().strip()
-            suggestions = []
             
             if not query:
                 # Return popular symbols if no query
@@ -205,57 +485,65 @@ class StockSymbolsService:
                     for symbol, name in popular_list
                 ]
             
-            # Search in popular symbols first
-            for symbol, name in self.popular_symbols.items():
-                if len(suggestions) >= limit:
-                    break
-                    
-                # Match by symbol
-                if symbol.startswith(query):
-                    suggestions.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'match_type': 'symbol_start',
-                        'score': 100
-                    })
-                elif query in symbol:
-                    suggestions.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'match_type': 'symbol_contains',
-                        'score': 80
-                    })
-                # Match by company name
-                elif query in name.upper():
-                    suggestions.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'match_type': 'name_contains',
-                        'score': 60
-                    })
-            
-            # Sort by score and match type priority
-            suggestions.sort(key=lambda x: (-x['score'], x['symbol']))
-            
-            return suggestions[:limit]
+            # Candidates arrive best first, so taking the first `limit` stops the scan early
+            return [
+                {
+                    'symbol': symbol,
+                    'name': self.popular_symbols[symbol],
+                    'match_type': match_type,
+                    'score': score
+                }
+                for symbol, match_type, score in islice(self._iter_matches(query), limit)
+            ]
             
         except Exception as e:
             self.logger.error(f'Error getting suggestions for query {query}: {str(e)}')
             return []
     
+    def _iter_matches(self, query: str):
+        """Yield (symbol, match_type, score) for an uppercased query, best matches first"""
+        seen = set()
+        
+        # Match by symbol prefix
+        node = self._symbol_trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                break
+        if node is not None:
+            for symbol in node.get('', []):
+                seen.add(symbol)
+                yield symbol, 'symbol_start', 100
+        
+        # Match by symbol substring
+        for symbol in self._symbol_list_sorted:
+            if symbol not in seen and query in symbol:
+                seen.add(symbol)
+                yield symbol, 'symbol_contains', 80
+        
+        # Match by any part of the company name; rows are in symbol order, so
+        # whole-word and partial hits come out interleaved alphabetically
+        if '\n' not in query:
+            for match in re.finditer(re.escape(query), self._name_blob):
+                symbol = self._symbol_list_sorted[bisect_right(self._name_row_starts, match.start()) - 1]
+                if symbol not in seen:
+                    seen.add(symbol)
+                    yield symbol, 'name_contains', 60
+    
     def get_symbol_info(self, symbol: str) -> Dict:
         """Get comprehensive information about a stock symbol"""
         try:
             symbol = symbol.upper().strip()
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            if not info or not info.get('longName'):
-                return {'error': 'Symbol not found'}
+            ticker = yf.Ticker(symbol, session=self.session)
             
-            # Get historical data for additional metrics
-            hist_1y = ticker.history(period="1y")
-            hist_5d = ticker.history(period="5d")
+            info = self._get_cached(self._info_cache, symbol, self.info_cache_duration)
+            if info is None:
+                info = ticker.info
+                
+                if not info or not info.get('longName'):
+                    return {'error': 'Symbol not found'}
+                
+                self._set_cached(self._info_cache, symbol, info, self.info_cache_size)
             
             result = {
                 'symbol': symbol,
@@ -280,11 +568,20 @@ class StockSymbolsService:
                 'currency': info.get('currency', 'USD')
             }
             
-            # Add volatility calculation if we have historical data
-            if not hist_5d.empty:
-                returns = hist_5d['Close'].pct_change().dropna()
-                if len(returns) > 1:
-                    result['volatility_5d'] = float(returns.std() * (252**0.5))  # Annualized
+            # Volatility refreshes on its own, shorter schedule than the profile
+            volatility = self._get_cached(self._volatility_cache, symbol, self.volatility_cache_duration)
+            if volatility is None:
+                # Get historical data for additional metrics
+                hist_5d = ticker.history(period="5d")
+                
+                # Add volatility calculation if we have historical data
+                if not hist_5d.empty:
+                    volatility = _annualized_volatility(hist_5d['Close'].to_numpy(dtype=np.float64))
+                    if volatility is not None:
+                        self._set_cached(self._volatility_cache, symbol, volatility, self.info_cache_size)
+            
+            if volatility is not None:
+                result['volatility_5d'] = volatility
             
             return result
             
@@ -295,9 +592,44 @@ class StockSymbolsService:
     def batch_validate(self, symbols: List[str]) -> Dict[str, Dict]:
         """Validate multiple symbols at once"""
         results = {}
+        unknown = {}
+        
+        # Popular symbols resolve from memory, only unknown ones need Yahoo Finance
         for symbol in symbols:
-            results[symbol] = self.validate_symbol(symbol)
-        return results
+            normalized = symbol.upper().strip()
+            if normalized in self.popular_symbols:
+                results[symbol] = self.validate_symbol(symbol)
+                continue
+            
+            cached = self._get_cached(self._validate_cache, normalized, self.validate_cache_duration)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                unknown.setdefault(normalized, []).append(symbol)
+        
+        if unknown:
+            # One quote request per QUOTE_BATCH_SIZE unknown symbols
+            quotes = self._batch_quote(list(unknown))
+            fallback = [normalized for normalized in unknown if normalized not in quotes]
+            
+            validated = {
+                normalized: self._build_validation_result(normalized, quote)
+                for normalized, quote in quotes.items()
+            }
+            
+            if fallback:
+                # Profile lookups are network bound, so overlap them in a thread pool
+                with ThreadPoolExecutor(max_workers=min(16, len(fallback))) as executor:
+                    for normalized, result in zip(fallback, executor.map(self._validate_with_info, fallback)):
+                        validated[normalized] = result
+            
+            for normalized, originals in unknown.items():
+                self._cache_validation(normalized, validated[normalized])
+                for symbol in originals:
+                    results[symbol] = validated[normalized]
+        
+        # Preserve the input ordering
+        return {symbol: results[symbol] for symbol in symbols}
 
 # Global instance
 stock_symbols_service = StockSymbolsService()
@@ -7,145 +7,705 @@ Provides advanced technical indicators, pattern recognition, and forecasting
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
 # Using pure pandas/numpy for technical analysis
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
 import json
+import os
+import tempfile
+import atexit
+import threading
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
 import time
+from numba_compat import njit
+
+TECHNICAL_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'options-scanner', 'technical.json')
+
+@dataclass(frozen=True)
+class OHLCV:
+    """Contiguous float32 price arrays and int64 volume for one symbol"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    # float64 copies for the price levels reported in the analysis; float32 would
+    # serialize 187.44 as 187.44000244140625
+    high_f64: np.ndarray
+    low_f64: np.ndarray
+    close_f64: np.ndarray
+    
+    @classmethod
+    def from_history(cls, hist: pd.DataFrame) -> 'OHLCV':
+        """Extract the OHLCV columns of a price history once"""
+        # One 2-D extraction into a (4, n) block; each row is a contiguous,
+        # writable view, which is what the compiled kernel signatures expect
+        prices = np.require(hist[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float32).T,
+                            requirements=['C', 'W'])
+        volume = np.require(hist['Volume'].fillna(0).to_numpy(dtype=np.int64), requirements=['C', 'W'])
+        levels = hist[['High', 'Low', 'Close']].to_numpy(dtype=np.float64).T
+        return cls(*prices, volume, *levels)
+
+def _relative_extrema(values: np.ndarray, order: int, greater: bool) -> np.ndarray:
+    """Indices strictly above (or below) every neighbour within `order` bars"""
+    # Edge padding reproduces argrelextrema's clip mode at both ends
+    windows = sliding_window_view(np.pad(values, order, mode='edge'), 2 * order + 1)
+    center = windows[:, order]
+    if greater:
+        mask = (center > windows[:, :order].max(axis=1)) & (center > windows[:, order + 1:].max(axis=1))
+    else:
+        mask = (center < windows[:, :order].min(axis=1)) & (center < windows[:, order + 1:].min(axis=1))
+    return np.flatnonzero(mask)
+
+class IndicatorValues(NamedTuple):
+    """Last-bar indicator values returned by the fused kernel"""
+    sma_20: float
+    sma_50: float
+    sma_200: float
+    ema_12: float
+    ema_26: float
+    rsi: float
+    stoch_k: float
+    stoch_d: float
+    macd: float
+    macd_signal: float
+    macd_histogram: float
+    bb_upper: float
+    bb_middle: float
+    bb_lower: float
+    bb_width: float
+    obv: float
+    ad_line: float
+    williams_r: float
+    cci: float
+    atr: float
+
+# Explicit signature so the kernel compiles (or loads from cache) at import
+@njit('UniTuple(float64, 20)(float32[::1], float32[::1], float32[::1], int64[::1])', cache=True, nogil=True)
+def _compute_all_indicators(high, low, close, volume):
+    """Last-bar values of the rolling indicators in one fused pass"""
+    # Inputs are float32; every accumulator below is float64 (or int64 for OBV)
+    n = close.size
+    rsi_period = 14
+    williams_period = 14
+    atr_period = 14
+    stoch_k_period = 14
+    stoch_d_period = 3
+    cci_period = 20
+    
+    sum_20 = 0.0
+    sum_50 = 0.0
+    sum_200 = 0.0
+    # Adjusted EMAs (as pandas ewm(adjust=True)) kept as weighted sums
+    decay_12 = 1.0 - 2.0 / 13.0
+    decay_26 = 1.0 - 2.0 / 27.0
+    decay_9 = 1.0 - 2.0 / 10.0
+    ema_12_num = 0.0
+    ema_12_den = 0.0
+    ema_26_num = 0.0
+    ema_26_den = 0.0
+    signal_num = 0.0
+    signal_den = 0.0
+    macd = np.nan
+    bb_count = 0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    obv = 0
+    ad_line = 0.0
+    highest_high = -np.inf
+    lowest_low = np.inf
+    atr = 0.0
+    prev_close = 0.0
+    c = 0.0
+    
+    for i in range(n):
+        h = np.float64(high[i])
+        l = np.float64(low[i])
+        c = np.float64(close[i])
+        hl = h - l
+        
+        # Window sums only collect the bars they end up averaging
+        if i >= n - 20:
+            sum_20 += c
+            # Welford update for the Bollinger standard deviation
+            bb_count += 1
+            diff = c - bb_mean
+            bb_mean += diff / bb_count
+            bb_m2 += diff * (c - bb_mean)
+        if i >= n - 50:
+            sum_50 += c
+        if i >= n - 200:
+            sum_200 += c
+        if i >= n - williams_period:
+            if h > highest_high:
+                highest_high = h
+            if l < lowest_low:
+                lowest_low = l
+        
+        # EMA 12/26 and the MACD signal line
+        ema_12_num = c + decay_12 * ema_12_num
+        ema_12_den = 1.0 + decay_12 * ema_12_den
+        ema_26_num = c + decay_26 * ema_26_num
+        ema_26_den = 1.0 + decay_26 * ema_26_den
+        macd = ema_12_num / ema_12_den - ema_26_num / ema_26_den
+        signal_num = macd + decay_9 * signal_num
+        signal_den = 1.0 + decay_9 * signal_den
+        
+        # Accumulation/Distribution (flat bars contribute nothing)
+        if hl > 0.0:
+            ad_line += ((c - l) - (h - c)) / hl * volume[i]
+        
+        if i == 0:
+            prev_close = c
+            continue
+        
+        delta = c - prev_close
+        
+        # On-Balance Volume, signed without branching
+        obv += (int(delta > 0.0) - int(delta < 0.0)) * volume[i]
+        
+        # RSI: simple average seed, then Wilder smoothing
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if i <= rsi_period:
+            avg_gain += gain / rsi_period
+            avg_loss += loss / rsi_period
+        else:
+            avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+        
+        # ATR: true range with the same seed and Wilder smoothing as RSI
+        tr = max(hl, abs(h - prev_close), abs(l - prev_close))
+        if i <= atr_period:
+            atr += tr / atr_period
+        else:
+            atr = (atr * (atr_period - 1) + tr) / atr_period
+        
+        prev_close = c
+    
+    sma_20 = sum_20 / 20 if n >= 20 else np.nan
+    sma_50 = sum_50 / 50 if n >= 50 else np.nan
+    sma_200 = sum_200 / 200 if n >= 200 else np.nan
+    ema_12 = ema_12_num / ema_12_den if n >= 12 else np.nan
+    ema_26 = ema_26_num / ema_26_den if n >= 26 else np.nan
+    macd_signal = signal_num / signal_den if n > 0 else np.nan
+    
+    macd_histogram = macd - macd_signal
+    
+    if n >= 20:
+        bb_std = np.sqrt(bb_m2 / 19)
+        bb_upper = sma_20 + 2 * bb_std
+        bb_lower = sma_20 - 2 * bb_std
+    else:
+        bb_upper = np.nan
+        bb_lower = np.nan
+    if bb_upper != 0.0 and bb_lower != 0.0 and sma_20 != 0.0:
+        bb_width = (bb_upper - bb_lower) / sma_20 * 100
+    else:
+        bb_width = np.nan
+    
+    # Stochastic: %K over the last few bars, %D as their average
+    stoch_k = np.nan
+    stoch_d = np.nan
+    if n >= stoch_k_period:
+        k_sum = 0.0
+        k_count = 0
+        for j in range(max(n - stoch_d_period, stoch_k_period - 1), n):
+            window_high = -np.inf
+            window_low = np.inf
+            for i in range(j - stoch_k_period + 1, j + 1):
+                window_high = max(window_high, np.float64(high[i]))
+                window_low = min(window_low, np.float64(low[i]))
+            if window_high > window_low:
+                stoch_k = 100.0 * (np.float64(close[j]) - window_low) / (window_high - window_low)
+            else:
+                stoch_k = np.nan
+            k_sum += stoch_k
+            k_count += 1
+        if k_count == stoch_d_period:
+            stoch_d = k_sum / stoch_d_period
+    
+    # CCI from the mean absolute deviation of the last typical prices
+    cci = np.nan
+    if n >= cci_period:
+        tp_mean = 0.0
+        for i in range(n - cci_period, n):
+            tp_mean += (np.float64(high[i]) + np.float64(low[i]) + np.float64(close[i])) / 3.0
+        tp_mean /= cci_period
+        mean_deviation = 0.0
+        for i in range(n - cci_period, n):
+            tp = (np.float64(high[i]) + np.float64(low[i]) + np.float64(close[i])) / 3.0
+            mean_deviation += abs(tp - tp_mean)
+        mean_deviation /= cci_period
+        if mean_deviation > 0.0:
+            last_tp = (np.float64(high[n - 1]) + np.float64(low[n - 1]) + c) / 3.0
+            cci = (last_tp - tp_mean) / (0.015 * mean_deviation)
+    
+    if n <= rsi_period:
+        rsi = np.nan
+    elif avg_loss == 0.0:
+        rsi = 100.0 if avg_gain > 0.0 else np.nan
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    if n >= williams_period and highest_high > lowest_low:
+        williams_r = -100.0 * (highest_high - c) / (highest_high - lowest_low)
+    else:
+        williams_r = np.nan
+    
+    if n <= atr_period:
+        atr = np.nan
+    
+    return (sma_20, sma_50, sma_200, ema_12, ema_26, rsi, stoch_k, stoch_d,
+            macd, macd_signal, macd_histogram, bb_upper, sma_20, bb_lower, bb_width,
+            float(obv), ad_line, williams_r, cci, atr)
+
+@njit('UniTuple(float64, 2)(float32[::1])', cache=True, nogil=True)
+def _slope_r(y):
+    """Least-squares slope and correlation of y against 0..n-1"""
+    n = y.size
+    x_mean = (n - 1) / 2.0
+    y_mean = 0.0
+    for i in range(n):
+        y_mean += y[i]
+    y_mean /= n
+    
+    sxy = 0.0
+    syy = 0.0
+    for i in range(n):
+        dy = y[i] - y_mean
+        sxy += (i - x_mean) * dy
+        syy += dy * dy
+    sxx = n * (n * n - 1) / 12.0
+    
+    slope = sxy / sxx
+    r = sxy / np.sqrt(sxx * syy) if syy > 0.0 else 0.0
+    return slope, r
+
+@njit('UniTuple(float64, 6)(float32[::1])', cache=True, nogil=True)
+def _risk_kernel(close):
+    """20/60-day volatility, Sharpe ratio, max drawdown and 95/99% VaR in one pass"""
+    n = close.size
+    recent_returns = np.empty(60)
+    count_20 = 0
+    mean_20 = 0.0
+    m2_20 = 0.0
+    count_60 = 0
+    mean_60 = 0.0
+    m2_60 = 0.0
+    peak = np.float64(close[0]) if n > 0 else 0.0
+    max_drawdown = 0.0
+    
+    for i in range(1, n):
+        prev = np.float64(close[i - 1])
+        c = np.float64(close[i])
+        
+        # Running peak for the drawdown
+        if c > peak:
+            peak = c
+        drawdown = (c - peak) / peak
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+        
+        # Welford updates over the trailing 20 and 60 returns
+        ret = (c - prev) / prev
+        if i >= n - 20:
+            count_20 += 1
+            diff = ret - mean_20
+            mean_20 += diff / count_20
+            m2_20 += diff * (ret - mean_20)
+        if i >= n - 60:
+            count_60 += 1
+            diff = ret - mean_60
+            mean_60 += diff / count_60
+            m2_60 += diff * (ret - mean_60)
+            recent_returns[i - (n - 60)] = ret
+    
+    annualize = np.sqrt(252.0)
+    vol_20 = np.sqrt(m2_20 / count_20) * annualize if count_20 > 0 else np.nan
+    vol_60 = np.nan
+    sharpe = np.nan
+    var_95 = np.nan
+    var_99 = np.nan
+    if count_60 == 60:
+        std_60 = np.sqrt(m2_60 / count_60)
+        vol_60 = std_60 * annualize
+        if std_60 > 0.0:
+            sharpe = mean_60 / std_60 * annualize
+        
+        # Historical VaR from the buffered last 60 returns
+        var_95 = np.percentile(recent_returns, 5.0)
+        var_99 = np.percentile(recent_returns, 1.0)
+    
+    return vol_20, vol_60, sharpe, max_drawdown, var_95, var_99
+
+@njit('UniTuple(float64, 7)(float32[::1])', cache=True, nogil=True)
+def _chart_stats(tail):
+    """Trend fit, breakout ranges and volatility of the last 30 closes"""
+    n = tail.size
+    anchor = np.float64(tail[n - 1])
+    prev_high = -np.inf
+    prev_low = np.inf
+    recent_high = -np.inf
+    recent_low = np.inf
+    sum_y = 0.0
+    sum_yy = 0.0
+    sum_xy = 0.0
+    
+    for k in range(n):
+        v = np.float64(tail[k])
+        
+        # Bars 30..11 back set the prior range, the last 10 the recent one
+        if k < n - 10:
+            prev_high = max(prev_high, v)
+            prev_low = min(prev_low, v)
+        else:
+            recent_high = max(recent_high, v)
+            recent_low = min(recent_low, v)
+        
+        # Last 20 bars feed the trend fit and volatility (centred on the last close)
+        if k >= n - 20:
+            x = k - (n - 20)
+            y = v - anchor
+            sum_y += y
+            sum_yy += y * y
+            sum_xy += x * y
+    
+    sum_x = 190.0   # sum of 0..19
+    sum_xx = 2470.0  # sum of squares of 0..19
+    sxy = 20 * sum_xy - sum_x * sum_y
+    sxx = 20 * sum_xx - sum_x * sum_x
+    syy = 20 * sum_yy - sum_y * sum_y
+    slope = sxy / sxx
+    r = sxy / np.sqrt(sxx * syy) if syy > 0.0 else 0.0
+    
+    mean = anchor + sum_y / 20
+    variance = max(sum_yy / 20 - (sum_y / 20) ** 2, 0.0)
+    volatility = np.sqrt(variance) / mean
+    
+    return slope, r, recent_high, recent_low, prev_high, prev_low, volatility
+
+TREND_WINDOWS = (('short_term', 20), ('medium_term', 50), ('long_term', 200))
+
+@njit('UniTuple(float64, 6)(float32[::1])', cache=True, nogil=True)
+def _trend_fits(close):
+    """Slope and r of the 20/50/200-bar trends from one backward pass"""
+    n = close.size
+    result = np.full(6, np.nan)
+    
+    # Slope and r are shift-invariant, so centre on the last close for precision
+    anchor = np.float64(close[n - 1]) if n > 0 else 0.0
+    sum_y = 0.0
+    sum_yy = 0.0
+    sum_ky = 0.0  # k counts bars back from the end
+    slot = 0
+    for k in range(min(n, 200)):
+        y = np.float64(close[n - 1 - k]) - anchor
+        sum_y += y
+        sum_yy += y * y
+        sum_ky += k * y
+        
+        window = k + 1
+        if window == 20 or window == 50 or window == 200:
+            # Regress against x = window-1-k, i.e. 0..window-1 oldest to newest
+            sum_x = window * (window - 1) / 2.0
+            sum_xx = (window - 1) * window * (2 * window - 1) / 6.0
+            sum_xy = (window - 1) * sum_y - sum_ky
+            sxy = window * sum_xy - sum_x * sum_y
+            sxx = window * sum_xx - sum_x * sum_x
+            syy = window * sum_yy - sum_y * sum_y
+            result[slot] = sxy / sxx
+            result[slot + 1] = sxy / np.sqrt(sxx * syy) if syy > 0.0 else 0.0
+            slot += 2
+    
+    return result[0], result[1], result[2], result[3], result[4], result[5]
+
+# Bit i of the _detect_candles mask is set when CANDLE_PATTERNS[i] matched
+CANDLE_PATTERNS = ('doji', 'hammer', 'shooting_star', 'engulfing_bullish',
+                   'engulfing_bearish', 'morning_star', 'evening_star')
+
+@njit('uint8(float32[::1], float32[::1], float32[::1], float32[::1])', cache=True, nogil=True)
+def _detect_candles(o, h, l, c):
+    """Candlestick bitmask for the last bar, given (up to) the last three bars"""
+    n = c.size
+    doji = False
+    hammer = False
+    shooting_star = False
+    engulfing_bullish = False
+    engulfing_bearish = False
+    morning_star = False
+    evening_star = False
+    
+    # Single-bar patterns
+    if n >= 1:
+        body = abs(c[-1] - o[-1])
+        range_val = h[-1] - l[-1]
+        upper_shadow = h[-1] - max(o[-1], c[-1])
+        lower_shadow = min(o[-1], c[-1]) - l[-1]
+        doji = range_val > 0 and body <= range_val * 0.1
+        hammer = lower_shadow >= body * 2 and upper_shadow <= body * 0.5
+        shooting_star = upper_shadow >= body * 2 and lower_shadow <= body * 0.5
+    
+    # Two-bar patterns
+    if n >= 2:
+        engulfing_bullish = (c[-2] < o[-2] and c[-1] > o[-1]
+                             and o[-1] < c[-2] and c[-1] > o[-2])
+        engulfing_bearish = (c[-2] > o[-2] and c[-1] < o[-1]
+                             and o[-1] > c[-2] and c[-1] < o[-2])
+    
+    # Three-bar patterns
+    if n >= 3:
+        small_body = abs(c[-2] - o[-2]) < abs(c[-3] - o[-3]) * 0.5
+        morning_star = (c[-3] < o[-3] and small_body and c[-1] > o[-1]
+                        and h[-2] < min(o[-3], c[-3]) and l[-1] > max(o[-2], c[-2]))
+        evening_star = (c[-3] > o[-3] and small_body and c[-1] < o[-1]
+                        and l[-2] > max(o[-3], c[-3]) and h[-1] < min(o[-2], c[-2]))
+    
+    return (int(doji) | int(hammer) << 1 | int(shooting_star) << 2 | int(engulfing_bullish) << 3
+            | int(engulfing_bearish) << 4 | int(morning_star) << 5 | int(evening_star) << 6)
+
+# Weights of the 11-step 0.15/0.85 smoothing in _generate_forecasts, oldest close first
+FORECAST_EMA_WEIGHTS = 0.15 * 0.85 ** np.arange(11)
 
 class TechnicalAnalysisService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.cache = {}
         self.cache_duration = 300  # 5 minutes cache
+        self._prefetched_history = {}
+        self._support_resistance_cache = {}  # symbol -> (last bar key, levels)
+        self._history_cache = {}  # symbol -> (fetch date, 1y daily history)
+        self._memoized_buckets = {}  # symbol -> cache window its analysis was last memoized for
+        
+        # Analyses persisted across restarts: symbol -> (saved time, last bar key, analysis)
+        self.disk_cache_duration = 86400  # 1 day
+        self.disk_cache_size = 1024  # same bound as the _compute_analysis memo
+        self._disk_cache = self._load_disk_cache()
+        self._disk_cache_lock = threading.Lock()
+        atexit.register(self._save_disk_cache)
         
     def get_technical_analysis(self, symbol: str) -> Dict:
         """Get comprehensive technical analysis for a stock"""
         try:
-            # Check cache first
-            cache_key = f"tech_analysis_{symbol}"
-            if self._is_cached(cache_key):
-                return self.cache[cache_key]['data']
-            
-            # Get stock data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="1y", interval="1d")
-            
-            if hist.empty:
-                return {'error': f'No data available for {symbol}'}
-            
-            analysis = {
-                'symbol': symbol,
-                'last_updated': datetime.now().isoformat(),
-                'technical_indicators': self._calculate_technical_indicators(hist),
-                'pattern_recognition': self._detect_patterns(hist),
-                'support_resistance': self._find_support_resistance(hist),
-                'trend_analysis': self._analyze_trends(hist),
-                'forecasting': self._generate_forecasts(hist),
-                'risk_metrics': self._calculate_risk_metrics(hist),
-                'trading_signals': self._generate_trading_signals(hist)
-            }
-            
-            # Cache the result
-            self._cache_data(cache_key, analysis)
-            
-            return analysis
+            return self._compute_analysis(symbol, self._cache_bucket())
             
         except Exception as e:
             self.logger.error(f'Error in technical analysis for {symbol}: {str(e)}')
             return {'error': str(e)}
     
-    def _calculate_technical_indicators(self, data: pd.DataFrame) -> Dict:
+    def get_technical_analysis_batch(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get technical analysis for several stocks with one history download"""
+        symbols = list(dict.fromkeys(symbols))
+        bucket = self._cache_bucket()
+        if not symbols:
+            return {}
+        
+        # Symbols already memoized for this window are served without a download
+        missing = {symbol for symbol in symbols if self._memoized_buckets.get(symbol) != bucket}
+        data = pd.DataFrame()
+        if missing:
+            try:
+                # Keep the exchange timezone like Ticker.history does, so cached frames
+                # can be topped up by later single-symbol fetches
+                data = yf.download(sorted(missing), period="1y", interval="1d", group_by='ticker',
+                                   auto_adjust=True, threads=True, progress=False, ignore_tz=False)
+            except Exception as e:
+                self.logger.error(f'Error downloading history for {sorted(missing)}: {str(e)}')
+        
+        def analyze(symbol: str) -> Dict:
+            try:
+                if symbol not in missing:
+                    return self._compute_analysis(symbol, bucket)
+                
+                # Multiple tickers come back under a (ticker, field) column index
+                if isinstance(data.columns, pd.MultiIndex):
+                    hist = data[symbol] if symbol in data.columns.get_level_values(0) else pd.DataFrame()
+                else:
+                    hist = data
+                
+                # Hand the downloaded history to the memoized analysis; symbols
+                # without usable rows fall back to their own fetch
+                if not hist.empty:
+                    hist = hist.dropna(subset=['Close'])
+                if not hist.empty:
+                    self._prefetched_history[symbol] = hist
+                    self._history_cache[symbol] = (date.today(), hist)
+                
+                return self._compute_analysis(symbol, bucket)
+                
+            except Exception as e:
+                self.logger.error(f'Error in technical analysis for {symbol}: {str(e)}')
+                return {'error': str(e)}
+            finally:
+                self._prefetched_history.pop(symbol, None)
+        
+        # The kernels release the GIL, so symbols are analyzed side by side
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+            return dict(zip(symbols, executor.map(analyze, symbols)))
+    
+    @lru_cache(maxsize=1024)
+    def _compute_analysis(self, symbol: str, bucket: int) -> Dict:
+        """Fetch and analyze one stock, memoized per symbol and cache window"""
+        analysis = self._fetch_and_analyze(symbol)
+        
+        # Only reached when the result is about to be memoized (exceptions aren't),
+        # so the batch path can skip downloading this symbol's history again
+        self._memoized_buckets[symbol] = bucket
+        return analysis
+    
+    def _fetch_and_analyze(self, symbol: str) -> Dict:
+        """Analyze one stock from prefetched, saved or freshly fetched history"""
+        hist = self._prefetched_history.pop(symbol, None)
+        if hist is None:
+            hist = self._fetch_history(symbol)
+        
+        if hist.empty:
+            return {'error': f'No data available for {symbol}'}
+        
+        # Reuse a saved analysis while the latest bar is unchanged; the bar is keyed by
+        # its calendar date since the Timestamp repr differs between tz-aware and naive frames
+        bar_key = f"{hist.index[-1].date().isoformat()}|{float(hist['Close'].iloc[-1])}"
+        saved = self._disk_cache.get(symbol)
+        if saved is not None and saved[1] == bar_key:
+            return saved[2]
+        
+        analysis = self._analyze_history(symbol, hist)
+        with self._disk_cache_lock:
+            # Re-insert so the dict stays oldest first, then drop the oldest beyond the cap
+            self._disk_cache.pop(symbol, None)
+            self._disk_cache[symbol] = (time.time(), bar_key, analysis)
+            while len(self._disk_cache) > self.disk_cache_size:
+                del self._disk_cache[next(iter(self._disk_cache))]
+        return analysis
+    
+    def _fetch_history(self, symbol: str) -> pd.DataFrame:
+        """1y daily history, fetched in full once a day and topped up afterwards"""
+        today = date.today()
+        ticker = yf.Ticker(symbol)
+        cached = self._history_cache.get(symbol)
+        
+        if cached is None or cached[0] != today:
+            hist = ticker.history(period="1y", interval="1d")
+        else:
+            # Older bars are final; only the last few can still change
+            hist = cached[1]
+            recent = ticker.history(period="5d", interval="1d")
+            if recent.empty:
+                pass
+            elif str(hist.index.tz) != str(recent.index.tz):
+                # A cached frame from another source (e.g. a mixed-exchange batch
+                # download) can't be compared against this one, so refetch in full
+                hist = ticker.history(period="1y", interval="1d")
+            else:
+                hist = pd.concat([hist[hist.index < recent.index[0]], recent])
+        
+        if not hist.empty:
+            self._history_cache[symbol] = (today, hist)
+        return hist
+    
+    def _read_disk_cache_file(self) -> Dict:
+        """Read unexpired analyses saved by a previous run"""
+        try:
+            with open(TECHNICAL_CACHE_FILE) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f'Could not load technical analysis cache: {str(e)}')
+            return {}
+        
+        now = time.time()
+        return {
+            symbol: (saved_time, bar_key, analysis)
+            for symbol, (saved_time, bar_key, analysis) in entries.items()
+            if now - saved_time < self.disk_cache_duration
+        }
+    
+    def _load_disk_cache(self) -> Dict:
+        """Load the newest saved analyses, oldest first, up to disk_cache_size"""
+        entries = sorted(self._read_disk_cache_file().items(), key=lambda item: item[1][0])
+        return dict(entries[-self.disk_cache_size:])
+    
+    def _save_disk_cache(self):
+        """Persist analyses for the next run, keeping the newest entry per symbol"""
+        try:
+            entries = self._read_disk_cache_file()
+            with self._disk_cache_lock:
+                for symbol, entry in self._disk_cache.items():
+                    if symbol not in entries or entries[symbol][0] < entry[0]:
+                        entries[symbol] = entry
+            entries = dict(sorted(entries.items(), key=lambda item: item[1][0])[-self.disk_cache_size:])
+            
+            # Every worker saves at exit, so write a private temp file and rename it into
+            # place; readers then see either the old file or the new one, never a partial one
+            cache_dir = os.path.dirname(TECHNICAL_CACHE_FILE)
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(temp_path, TECHNICAL_CACHE_FILE)
+            except Exception:
+                os.unlink(temp_path)
+                raise
+        except Exception as e:
+            self.logger.warning(f'Could not save technical analysis cache: {str(e)}')
+    
+    def _cache_bucket(self) -> int:
+        """Index of the current cache_duration window"""
+        return int(time.time() // self.cache_duration)
+    
+    def _analyze_history(self, symbol: str, hist: pd.DataFrame) -> Dict:
+        """Build the full analysis for one symbol from its price history"""
+        ohlcv = OHLCV.from_history(hist)
+        indicators = self._calculate_technical_indicators(ohlcv)
+        patterns = self._detect_patterns(ohlcv)
+        support_resistance = self._get_support_resistance(symbol, ohlcv)
+        
+        return {
+            'symbol': symbol,
+            'last_updated': datetime.now().isoformat(),
+            'technical_indicators': indicators,
+            'pattern_recognition': patterns,
+            'support_resistance': support_resistance,
+            'trend_analysis': self._analyze_trends(ohlcv),
+            'forecasting': self._generate_forecasts(ohlcv, support_resistance),
+            'risk_metrics': self._calculate_risk_metrics(ohlcv),
+            'trading_signals': self._generate_trading_signals(indicators, patterns)
+        }
+    
+    def _calculate_technical_indicators(self, ohlcv: OHLCV) -> Dict:
         """Calculate comprehensive technical indicators"""
         try:
-            close = data['Close']
-            high = data['High']
-            low = data['Low']
-            volume = data['Volume']
-            
-            indicators = {}
-            
-            # Moving Averages
-            indicators['sma_20'] = float(close.rolling(window=20).mean().iloc[-1]) if len(close) >= 20 else None
-            indicators['sma_50'] = float(close.rolling(window=50).mean().iloc[-1]) if len(close) >= 50 else None
-            indicators['sma_200'] = float(close.rolling(window=200).mean().iloc[-1]) if len(close) >= 200 else None
-            indicators['ema_12'] = float(close.ewm(span=12).mean().iloc[-1]) if len(close) >= 12 else None
-            indicators['ema_26'] = float(close.ewm(span=26).mean().iloc[-1]) if len(close) >= 26 else None
-            
-            # RSI
-            indicators['rsi'] = self._calculate_rsi(close) if len(close) >= 14 else None
-            
-            # Stochastic
-            stoch_k, stoch_d = self._calculate_stochastic(high, low, close)
-            indicators['stoch_k'] = stoch_k
-            indicators['stoch_d'] = stoch_d
-            
-            # MACD
-            macd, macd_signal, macd_hist = self._calculate_macd(close)
-            indicators['macd'] = macd
-            indicators['macd_signal'] = macd_signal
-            indicators['macd_histogram'] = macd_hist
-            
-            # Bollinger Bands
-            bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(close)
-            indicators['bb_upper'] = bb_upper
-            indicators['bb_middle'] = bb_middle
-            indicators['bb_lower'] = bb_lower
-            indicators['bb_width'] = (bb_upper - bb_lower) / bb_middle * 100 if all([bb_upper, bb_lower, bb_middle]) else None
-            
-            # Volume indicators
-            indicators['obv'] = self._calculate_obv(close, volume)
-            indicators['ad_line'] = self._calculate_ad_line(high, low, close, volume)
-            
-            # Momentum indicators
-            indicators['williams_r'] = self._calculate_williams_r(high, low, close)
-            indicators['cci'] = self._calculate_cci(high, low, close)
-            indicators['atr'] = self._calculate_atr(high, low, close)
-            
-            # Clean None values and convert numpy types to Python types
-            cleaned_indicators = {}
-            for k, v in indicators.items():
-                if v is not None and not (isinstance(v, (int, float)) and np.isnan(v)):
-                    if isinstance(v, np.ndarray):
-                        cleaned_indicators[k] = float(v) if len(v) > 0 else None
-                    elif isinstance(v, (np.integer, np.floating)):
-                        cleaned_indicators[k] = float(v)
-                    elif isinstance(v, np.bool_):
-                        cleaned_indicators[k] = bool(v)
-                    else:
-                        cleaned_indicators[k] = v
-            
-            return cleaned_indicators
+            # Every indicator comes out of one fused pass over the arrays
+            values = IndicatorValues(*_compute_all_indicators(ohlcv.high, ohlcv.low, ohlcv.close, ohlcv.volume))
+            
+            # Drop indicators without enough history
+            return {k: float(v) for k, v in values._asdict().items() if not np.isnan(v)}
             
         except Exception as e:
             self.logger.error(f'Error calculating technical indicators: {str(e)}')
             return {}
     
-    def _detect_patterns(self, data: pd.DataFrame) -> Dict:
+    def _detect_patterns(self, ohlcv: OHLCV) -> Dict:
         """Detect candlestick patterns and chart patterns"""
         try:
-            open_prices = data['Open'].values
-            high = data['High'].values
-            low = data['Low'].values
-            close = data['Close'].values
-            
-            patterns = {}
+            open_prices = ohlcv.open
+            high = ohlcv.high
+            low = ohlcv.low
+            close = ohlcv.close
             
-            # Candlestick patterns - using pandas-ta or custom logic
-            patterns['doji'] = self._detect_doji(open_prices, high, low, close)
-            patterns['hammer'] = self._detect_hammer(open_prices, high, low, close)
-            patterns['shooting_star'] = self._detect_shooting_star(open_prices, high, low, close)
-            patterns['engulfing_bullish'] = self._detect_bullish_engulfing(open_prices, high, low, close)
-            patterns['engulfing_bearish'] = self._detect_bearish_engulfing(open_prices, high, low, close)
-            patterns['morning_star'] = self._detect_morning_star(open_prices, high, low, close)
-            patterns['evening_star'] = self._detect_evening_star(open_prices, high, low, close)
+            # Candlestick patterns only look at the last three bars
+            flags = _detect_candles(open_prices[-3:], high[-3:], low[-3:], close[-3:])
+            patterns = {name: bool(flags >> bit & 1) for bit, name in enumerate(CANDLE_PATTERNS)}
             
             # Chart patterns (simplified detection)
-            patterns.update(self._detect_chart_patterns(data))
+            patterns.update(self._detect_chart_patterns(ohlcv))
             
             return patterns
             
@@ -153,33 +713,28 @@ class TechnicalAnalysisService:
             self.logger.error(f'Error detecting patterns: {str(e)}')
             return {}
     
-    def _detect_chart_patterns(self, data: pd.DataFrame) -> Dict:
+    def _detect_chart_patterns(self, ohlcv: OHLCV) -> Dict:
         """Detect chart patterns like head and shoulders, triangles, etc."""
         try:
-            close = data['Close'].values
+            close = ohlcv.close
             patterns = {}
             
             if len(close) < 50:
                 return patterns
             
-            # Simple trend detection
-            recent_data = close[-20:]
-            slope, _, r_value, _, _ = stats.linregress(range(len(recent_data)), recent_data)
+            # One pass over the last 30 bars
+            (slope, r_value, recent_high, recent_low,
+             prev_high, prev_low, volatility) = _chart_stats(close[-30:])
             
+            # Simple trend detection
             patterns['trend_direction'] = 'bullish' if slope > 0 else 'bearish'
             patterns['trend_strength'] = abs(r_value)
             
             # Support/Resistance breakout detection
-            recent_high = np.max(close[-10:])
-            recent_low = np.min(close[-10:])
-            prev_high = np.max(close[-30:-10])
-            prev_low = np.min(close[-30:-10])
-            
             patterns['resistance_breakout'] = bool(recent_high > prev_high * 1.02)
             patterns['support_breakdown'] = bool(recent_low < prev_low * 0.98)
             
             # Volatility patterns
-            volatility = np.std(close[-20:]) / np.mean(close[-20:])
             patterns['high_volatility'] = bool(volatility > 0.03)
             patterns['low_volatility'] = bool(volatility < 0.01)
             
@@ -189,22 +744,31 @@ class TechnicalAnalysisService:
             self.logger.error(f'Error detecting chart patterns: {str(e)}')
             return {}
     
-    def _find_support_resistance(self, data: pd.DataFrame) -> Dict:
+    def _get_support_resistance(self, symbol: str, ohlcv: OHLCV) -> Dict:
+        """Support/resistance levels, reused until the symbol's last bar changes"""
+        bar_key = (len(ohlcv.close), float(ohlcv.high[-1]), float(ohlcv.low[-1]), float(ohlcv.close[-1]))
+        cached = self._support_resistance_cache.get(symbol)
+        if cached is not None and cached[0] == bar_key:
+            return cached[1]
+        
+        support_resistance = self._find_support_resistance(ohlcv)
+        if support_resistance:
+            self._support_resistance_cache[symbol] = (bar_key, support_resistance)
+        return support_resistance
+    
+    def _find_support_resistance(self, ohlcv: OHLCV) -> Dict:
         """Find support and resistance levels"""
         try:
-            close = data['Close'].values
-            high = data['High'].values
-            low = data['Low'].values
-            
-            # Find local maxima and minima
-            from scipy.signal import argrelextrema
+            close = ohlcv.close_f64
+            high = ohlcv.high_f64
+            low = ohlcv.low_f64
             
             # Resistance levels (local maxima)
-            resistance_indices = argrelextrema(high, np.greater, order=5)[0]
+            resistance_indices = _relative_extrema(high, 5, greater=True)
             resistance_levels = [float(high[i]) for i in resistance_indices[-5:]]  # Last 5 resistance levels
             
             # Support levels (local minima)
-            support_indices = argrelextrema(low, np.less, order=5)[0]
+            support_indices = _relative_extrema(low, 5, greater=False)
             support_levels = [float(low[i]) for i in support_indices[-5:]]  # Last 5 support levels
             
             current_price = float(close[-1])
@@ -225,42 +789,27 @@ class TechnicalAnalysisService:
             self.logger.error(f'Error finding support/resistance: {str(e)}')
             return {}
     
-    def _analyze_trends(self, data: pd.DataFrame) -> Dict:
+    def _analyze_trends(self, ohlcv: OHLCV) -> Dict:
         """Analyze price trends and momentum"""
         try:
-            close = data['Close'].values
+            close = ohlcv.close
             
             trends = {}
             
-            # Short-term trend (20 days)
-            if len(close) >= 20:
-                short_slope, _, short_r, _, _ = stats.linregress(range(20), close[-20:])
-                trends['short_term'] = {
-                    'direction': 'bullish' if short_slope > 0 else 'bearish',
-                    'strength': abs(short_r),
-                    'slope': float(short_slope)
-                }
-            
-            # Medium-term trend (50 days)
-            if len(close) >= 50:
-                med_slope, _, med_r, _, _ = stats.linregress(range(50), close[-50:])
-                trends['medium_term'] = {
-                    'direction': 'bullish' if med_slope > 0 else 'bearish',
-                    'strength': abs(med_r),
-                    'slope': float(med_slope)
-                }
-            
-            # Long-term trend (200 days)
-            if len(close) >= 200:
-                long_slope, _, long_r, _, _ = stats.linregress(range(200), close[-200:])
-                trends['long_term'] = {
-                    'direction': 'bullish' if long_slope > 0 else 'bearish',
-                    'strength': abs(long_r),
-                    'slope': float(long_slope)
-                }
+            # Short (20), medium (50) and long-term (200 days) trends in one pass
+            fits = _trend_fits(close)
+            for i, (name, window) in enumerate(TREND_WINDOWS):
+                if len(close) >= window:
+                    slope, r_value = fits[2 * i], fits[2 * i + 1]
+                    trends[name] = {
+                        'direction': 'bullish' if slope > 0 else 'bearish',
+                        'strength': abs(r_value),
+                        'slope': float(slope)
+                    }
             
             # Momentum analysis
             if len(close) >= 10:
+                close = ohlcv.close_f64
                 momentum_5d = (close[-1] - close[-6]) / close[-6] * 100
                 momentum_10d = (close[-1] - close[-11]) / close[-11] * 100
                 
@@ -275,37 +824,33 @@ class TechnicalAnalysisService:
             self.logger.error(f'Error analyzing trends: {str(e)}')
             return {}
     
-    def _generate_forecasts(self, data: pd.DataFrame) -> Dict:
+    def _generate_forecasts(self, ohlcv: OHLCV, support_resistance: Optional[Dict] = None) -> Dict:
         """Generate price forecasts using multiple models"""
         try:
-            close = data['Close'].values
+            close = ohlcv.close
+            close_f64 = ohlcv.close_f64  # for the reported price levels
             
             if len(close) < 30:
                 return {'error': 'Insufficient data for forecasting'}
             
             forecasts = {}
             
-            # Linear regression forecast
-            X = np.arange(len(close)).reshape(-1, 1)
-            y = close
-            
-            model = LinearRegression()
-            model.fit(X, y)
+            # Linear regression forecast (closed-form least squares over the whole series)
+            n = len(close)
+            slope, r_value = _slope_r(close)
+            intercept = float(close_f64.mean()) - slope * (n - 1) / 2.0
             
             # Forecast next 5 days
-            future_days = np.arange(len(close), len(close) + 5).reshape(-1, 1)
-            linear_forecast = model.predict(future_days)
+            linear_forecast = intercept + slope * np.arange(n, n + 5)
             
             forecasts['linear_regression'] = {
                 'next_5_days': [float(x) for x in linear_forecast],
-                'confidence': float(model.score(X, y))
+                'confidence': float(r_value ** 2)
             }
             
             # Moving average forecast
-            sma_20 = np.mean(close[-20:])
-            ema_12 = close[-1]
-            for i in range(11):
-                ema_12 = 0.15 * close[-1-i] + 0.85 * ema_12
+            sma_20 = np.mean(close_f64[-20:])
+            ema_12 = 0.85 ** 11 * close_f64[-1] + np.dot(close_f64[-11:], FORECAST_EMA_WEIGHTS)
             
             forecasts['moving_average'] = {
                 'sma_20_target': float(sma_20),
@@ -313,8 +858,8 @@ class TechnicalAnalysisService:
             }
             
             # Volatility-based forecast
-            volatility = np.std(close[-20:])
-            current_price = close[-1]
+            volatility = np.std(close_f64[-20:])
+            current_price = close_f64[-1]
             
             forecasts['volatility_bands'] = {
                 'upper_1std': float(current_price + volatility),
@@ -324,8 +869,10 @@ class TechnicalAnalysisService:
             }
             
             # Price targets based on technical levels
-            resistance_levels = self._find_support_resistance(data).get('resistance_levels', [])
-            support_levels = self._find_support_resistance(data).get('support_levels', [])
+            if support_resistance is None:
+                support_resistance = self._find_support_resistance(ohlcv)
+            resistance_levels = support_resistance.get('resistance_levels', [])
+            support_levels = support_resistance.get('support_levels', [])
             
             forecasts['technical_targets'] = {
                 'upside_target': resistance_levels[0] if resistance_levels else None,
@@ -338,27 +885,28 @@ class TechnicalAnalysisService:
             self.logger.error(f'Error generating forecasts: {str(e)}')
             return {}
     
-    def _calculate_risk_metrics(self, data: pd.DataFrame) -> Dict:
+    def _calculate_risk_metrics(self, ohlcv: OHLCV) -> Dict:
         """Calculate risk and volatility metrics"""
         try:
-            close = data['Close'].values
+            close = ohlcv.close
             
             if len(close) < 20:
                 return {}
             
-            returns = np.diff(close) / close[:-1]
+            # Annualized volatility, Sharpe, drawdown and VaR from one pass
+            vol_20, vol_60, sharpe, max_drawdown, var_95, var_99 = _risk_kernel(close)
             
             metrics = {
-                'volatility_20d': float(np.std(returns[-20:]) * np.sqrt(252)),  # Annualized
-                'volatility_60d': float(np.std(returns[-60:]) * np.sqrt(252)) if len(returns) >= 60 else None,
-                'sharpe_ratio': float(np.mean(returns[-60:]) / np.std(returns[-60:]) * np.sqrt(252)) if len(returns) >= 60 and np.std(returns[-60:]) > 0 else None,
-                'max_drawdown': self._calculate_max_drawdown(close),
-                'var_95': float(np.percentile(returns[-60:], 5)) if len(returns) >= 60 else None,
-                'var_99': float(np.percentile(returns[-60:], 1)) if len(returns) >= 60 else None
+                'volatility_20d': vol_20,
+                'volatility_60d': vol_60,
+                'sharpe_ratio': sharpe,
+                'max_drawdown': max_drawdown,
+                'var_95': var_95,
+                'var_99': var_99
             }
             
-            # Clean None values
-            metrics = {k: v for k, v in metrics.items() if v is not None and not np.isnan(v)}
+            # Drop metrics the history was too short for
+            metrics = {k: float(v) for k, v in metrics.items() if not np.isnan(v)}
             
             return metrics
             
@@ -366,21 +914,9 @@ class TechnicalAnalysisService:
             self.logger.error(f'Error calculating risk metrics: {str(e)}')
             return {}
     
-    def _calculate_max_drawdown(self, prices: np.ndarray) -> float:
-        """Calculate maximum drawdown"""
+    def _generate_trading_signals(self, indicators: Dict, patterns: Dict) -> Dict:
+        """Generate trading signals from computed indicators and patterns"""
         try:
-            peak = np.maximum.accumulate(prices)
-            drawdown = (prices - peak) / peak
-            return float(np.min(drawdown))
-        except:
-            return 0.0
-    
-    def _generate_trading_signals(self, data: pd.DataFrame) -> Dict:
-        """Generate trading signals based on technical analysis"""
-        try:
-            indicators = self._calculate_technical_indicators(data)
-            patterns = self._detect_patterns(data)
-            
             signals = {
                 'overall_signal': 'neutral',
                 'signal_strength': 0.0,
@@ -448,189 +984,6 @@ class TechnicalAnalysisService:
         except Exception as e:
             self.logger.error(f'Error generating trading signals: {str(e)}')
             return {'overall_signal': 'neutral', 'signal_strength': 0.0, 'signals': []}
-    
-    def _is_cached(self, cache_key: str) -> bool:
-        """Check if data is cached and still valid"""
-        if cache_key not in self.cache:
-            return False
-        
-        cache_time = self.cache[cache_key]['timestamp']
-        return (time.time() - cache_time) < self.cache_duration
-    
-    def _cache_data(self, cache_key: str, data: Dict):
-        """Cache data with timestamp"""
-        self.cache[cache_key] = {
-            'data': data,
-            'timestamp': time.time()
-        }
-    
-    def _detect_doji(self, open_prices, high, low, close):
-        """Detect Doji candlestick pattern"""
-        if len(close) < 1:
-            return False
-        body = abs(close[-1] - open_prices[-1])
-        range_val = high[-1] - low[-1]
-        return body <= (range_val * 0.1) if range_val > 0 else False
-    
-    def _detect_hammer(self, open_prices, high, low, close):
-        """Detect Hammer candlestick pattern"""
-        if len(close) < 1:
-            return False
-        body = abs(close[-1] - open_prices[-1])
-        lower_shadow = min(open_prices[-1], close[-1]) - low[-1]
-        upper_shadow = high[-1] - max(open_prices[-1], close[-1])
-        return lower_shadow >= (body * 2) and upper_shadow <= (body * 0.5)
-    
-    def _detect_shooting_star(self, open_prices, high, low, close):
-        """Detect Shooting Star candlestick pattern"""
-        if len(close) < 1:
-            return False
-        body = abs(close[-1] - open_prices[-1])
-        upper_shadow = high[-1] - max(open_prices[-1], close[-1])
-        lower_shadow = min(open_prices[-1], close[-1]) - low[-1]
-        return upper_shadow >= (body * 2) and lower_shadow <= (body * 0.5)
-    
-    def _detect_bullish_engulfing(self, open_prices, high, low, close):
-        """Detect Bullish Engulfing pattern"""
-        if len(close) < 2:
-            return False
-        prev_bearish = close[-2] < open_prices[-2]
-        curr_bullish = close[-1] > open_prices[-1]
-        engulfing = open_prices[-1] < close[-2] and close[-1] > open_prices[-2]
-        return prev_bearish and curr_bullish and engulfing
-    
-    def _detect_bearish_engulfing(self, open_prices, high, low, close):
-        """Detect Bearish Engulfing pattern"""
-        if len(close) < 2:
-            return False
-        prev_bullish = close[-2] > open_prices[-2]
-        curr_bearish = close[-1] < open_prices[-1]
-        engulfing = open_prices[-1] > close[-2] and close[-1] < open_prices[-2]
-        return prev_bullish and curr_bearish and engulfing
-    
-    def _detect_morning_star(self, open_prices, high, low, close):
-        """Detect Morning Star pattern"""
-        if len(close) < 3:
-            return False
-        first_bearish = close[-3] < open_prices[-3]
-        small_body = abs(close[-2] - open_prices[-2]) < abs(close[-3] - open_prices[-3]) * 0.5
-        third_bullish = close[-1] > open_prices[-1]
-        gap_down = high[-2] < min(open_prices[-3], close[-3])
-        gap_up = low[-1] > max(open_prices[-2], close[-2])
-        return first_bearish and small_body and third_bullish and gap_down and gap_up
-    
-    def _detect_evening_star(self, open_prices, high, low, close):
-        """Detect Evening Star pattern"""
-        if len(close) < 3:
-            return False
-        first_bullish = close[-3] > open_prices[-3]
-        small_body = abs(close[-2] - open_prices[-2]) < abs(close[-3] - open_prices[-3]) * 0.5
-        third_bearish = close[-1] < open_prices[-1]
-        gap_up = low[-2] > max(open_prices[-3], close[-3])
-        gap_down = high[-1] < min(open_prices[-2], close[-2])
-        return first_bullish and small_body and third_bearish and gap_up and gap_down
-    
-    def _calculate_rsi(self, close, period=14):
-        """Calculate RSI using pure pandas"""
-        try:
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return float(rsi.iloc[-1]) if not rsi.empty else None
-        except:
-            return None
-    
-    def _calculate_stochastic(self, high, low, close, k_period=14, d_period=3):
-        """Calculate Stochastic oscillator"""
-        try:
-            lowest_low = low.rolling(window=k_period).min()
-            highest_high = high.rolling(window=k_period).max()
-            k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-            d_percent = k_percent.rolling(window=d_period).mean()
-            return (float(k_percent.iloc[-1]) if not k_percent.empty else None,
-                    float(d_percent.iloc[-1]) if not d_percent.empty else None)
-        except:
-            return None, None
-    
-    def _calculate_macd(self, close, fast=12, slow=26, signal=9):
-        """Calculate MACD"""
-        try:
-            ema_fast = close.ewm(span=fast).mean()
-            ema_slow = close.ewm(span=slow).mean()
-            macd = ema_fast - ema_slow
-            macd_signal = macd.ewm(span=signal).mean()
-            macd_histogram = macd - macd_signal
-            return (float(macd.iloc[-1]) if not macd.empty else None,
-                    float(macd_signal.iloc[-1]) if not macd_signal.empty else None,
-                    float(macd_histogram.iloc[-1]) if not macd_histogram.empty else None)
-        except:
-            return None, None, None
-    
-    def _calculate_bollinger_bands(self, close, period=20, std_dev=2):
-        """Calculate Bollinger Bands"""
-        try:
-            sma = close.rolling(window=period).mean()
-            std = close.rolling(window=period).std()
-            upper_band = sma + (std * std_dev)
-            lower_band = sma - (std * std_dev)
-            return (float(upper_band.iloc[-1]) if not upper_band.empty else None,
-                    float(sma.iloc[-1]) if not sma.empty else None,
-                    float(lower_band.iloc[-1]) if not lower_band.empty else None)
-        except:
-            return None, None, None
-    
-    def _calculate_obv(self, close, volume):
-        """Calculate On-Balance Volume"""
-        try:
-            obv = (np.sign(close.diff()) * volume).fillna(0).cumsum()
-            return float(obv.iloc[-1]) if not obv.empty else None
-        except:
-            return None
-    
-    def _calculate_ad_line(self, high, low, close, volume):
-        """Calculate Accumulation/Distribution Line"""
-        try:
-            clv = ((close - low) - (high - close)) / (high - low)
-            clv = clv.fillna(0)
-            ad_line = (clv * volume).cumsum()
-            return float(ad_line.iloc[-1]) if not ad_line.empty else None
-        except:
-            return None
-    
-    def _calculate_williams_r(self, high, low, close, period=14):
-        """Calculate Williams %R"""
-        try:
-            highest_high = high.rolling(window=period).max()
-            lowest_low = low.rolling(window=period).min()
-            williams_r = -100 * ((highest_high - close) / (highest_high - lowest_low))
-            return float(williams_r.iloc[-1]) if not williams_r.empty else None
-        except:
-            return None
-    
-    def _calculate_cci(self, high, low, close, period=20):
-        """Calculate Commodity Channel Index"""
-        try:
-            typical_price = (high + low + close) / 3
-            sma = typical_price.rolling(window=period).mean()
-            mean_deviation = typical_price.rolling(window=period).apply(lambda x: np.mean(np.abs(x - x.mean())))
-            cci = (typical_price - sma) / (0.015 * mean_deviation)
-            return float(cci.iloc[-1]) if not cci.empty else None
-        except:
-            return None
-    
-    def _calculate_atr(self, high, low, close, period=14):
-        """Calculate Average True Range"""
-        try:
-            high_low = high - low
-            high_close = np.abs(high - close.shift())
-            low_close = np.abs(low - close.shift())
-            true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-            atr = pd.Series(true_range).rolling(window=period).mean()
-            return float(atr.iloc[-1]) if not atr.empty else None
-        except:
-            return None
 
 # Global instance
 technical_analysis_service = TechnicalAnalysisService()
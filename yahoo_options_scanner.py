@@ -8,17 +8,102 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import repeat
 from tabulate import tabulate
 from colorama import Fore, Style, init
-from scipy.stats import norm
 import math
+import time
+from numba_compat import njit
 import warnings
 warnings.filterwarnings('ignore')
 
 # Initialize colorama
 init()
 
+# Standard normal density at 0, scales exp(-x^2/2) into the pdf
+INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+INV_SQRT_2 = 1.0 / math.sqrt(2.0)
+
+@njit('UniTuple(float64[::1], 4)(float64, float64[::1], float64[::1], float64, float64[::1], boolean[::1])',
+      cache=True, nogil=True)
+def _greeks_kernel(S, K, T, r, sigma, is_call):
+    """Black-Scholes delta, gamma, theta and rho for a flat batch of one symbol's contracts"""
+    n = K.size
+    delta = np.zeros(n)
+    gamma = np.zeros(n)
+    theta = np.zeros(n)
+    rho = np.zeros(n)
+    
+    for i in range(n):
+        k = K[i]
+        t = T[i]
+        vol = sigma[i]
+        
+        # Expired contracts and those without a usable volatility or strike keep zero Greeks
+        if not (t > 0.0 and vol > 0.0 and k > 0.0):
+            continue
+        
+        sqrt_t = math.sqrt(t)
+        discount = math.exp(-r * t)
+        vol_sqrt_t = vol * sqrt_t
+        d1 = (math.log(S / k) + (r + 0.5 * vol * vol) * t) / vol_sqrt_t
+        d2 = d1 - vol_sqrt_t
+        pdf_d1 = INV_SQRT_2PI * math.exp(-0.5 * d1 * d1)
+        cdf_d1 = 0.5 * math.erfc(-d1 * INV_SQRT_2)
+        decay = -S * pdf_d1 * vol / (2 * sqrt_t)
+        
+        # +1 for calls, -1 for puts: N(sign * d2) is N(d2) or N(-d2) from one erfc,
+        # so calls and puts share the same straight-line formulas
+        sign = 2.0 * is_call[i] - 1.0
+        cdf_signed_d2 = 0.5 * math.erfc(-sign * d2 * INV_SQRT_2)
+        delta[i] = cdf_d1 + 0.5 * (sign - 1.0)
+        rho[i] = sign * k * t * discount * cdf_signed_d2 / 100
+        theta[i] = (decay - sign * r * k * discount * cdf_signed_d2) / 365
+        gamma[i] = pdf_d1 / (S * vol_sqrt_t)
+    
+    return delta, gamma, theta, rho
+
+# Option type is stored as a category; every chain shares these categories so
+# the final concat keeps the compact dtype
+OPTION_TYPE_DTYPE = pd.CategoricalDtype(['CALL', 'PUT'])
+
+# Chain columns carried into scan results; the rest of Yahoo's chain is never read
+CHAIN_COLUMNS = ['contractSymbol', 'strike', 'lastPrice', 'bid', 'ask', 'volume', 'openInterest', 'impliedVolatility']
+
+# Quote info and expiration lists are reused across scans for this many seconds
+QUOTE_CACHE_DURATION = 300
+
+@lru_cache(maxsize=256)
+def _get_quote(symbol: str, bucket: int) -> Tuple:
+    """Fetch a symbol's current price and market cap, memoized per cache time bucket"""
+    ticker = yf.Ticker(symbol)
+    
+    # fast_info reads a small quote endpoint instead of the full quote summary
+    try:
+        current_price = ticker.fast_info.last_price
+    except Exception:
+        current_price = None
+    try:
+        market_cap = ticker.fast_info.market_cap
+    except Exception:
+        market_cap = None
+    
+    # Only pay for the full quote summary when the light endpoint has no price
+    if not current_price:
+        stock_info = ticker.info
+        current_price = stock_info.get('currentPrice') or stock_info.get('regularMarketPrice')
+        market_cap = market_cap or stock_info.get('marketCap', 0)
+    
+    return current_price, market_cap or 0
+
+@lru_cache(maxsize=256)
+def _get_expirations(symbol: str, bucket: int):
+    """Fetch a symbol's option expiration dates, memoized per cache time bucket"""
+    return yf.Ticker(symbol).options
+
 class YahooOptionsScanner:
     def __init__(self):
         """Initialize the scanner"""
@@ -58,35 +143,31 @@ class YahooOptionsScanner:
         print(f"✅ Filtered to {len(filtered_dates)} expiration dates")
         return filtered_dates
     
-    def calculate_greeks(self, S, K, T, r, sigma, option_type='call'):
-        """Calculate option Greeks using Black-Scholes model"""
+    def calculate_greeks(self, S, K, T, r, sigma, is_call):
+        """Calculate option Greeks using Black-Scholes model for arrays of contracts"""
+        # The kernel takes contiguous, writeable 1-D columns, one value per contract
+        K = np.require(np.ravel(K), dtype=np.float64, requirements=['C', 'W'])
+        T = np.require(np.broadcast_to(T, K.shape), dtype=np.float64, requirements=['C', 'W'])
+        sigma = np.require(np.broadcast_to(sigma, K.shape), dtype=np.float64, requirements=['C', 'W'])
+        is_call = np.require(np.broadcast_to(is_call, K.shape), dtype=np.bool_, requirements=['C', 'W'])
+        zeros = np.zeros(K.shape, dtype=np.float32)
+        
         try:
-            if T <= 0 or sigma <= 0:
-                return {'delta': 0, 'gamma': 0, 'theta': 0, 'rho': 0}
+            if S <= 0:
+                return {greek: zeros.copy() for greek in ('delta', 'gamma', 'theta', 'rho')}
             
             # Black-Scholes calculations
-            d1 = (np.log(S/K) + (r + 0.5*sigma**2)*T) / (sigma*np.sqrt(T))
-            d2 = d1 - sigma*np.sqrt(T)
-            
-            if option_type.lower() == 'call':
-                delta = norm.cdf(d1)
-                rho = K*T*np.exp(-r*T)*norm.cdf(d2) / 100
-                theta = (-S*norm.pdf(d1)*sigma/(2*np.sqrt(T)) - r*K*np.exp(-r*T)*norm.cdf(d2)) / 365
-            else:  # put
-                delta = norm.cdf(d1) - 1
-                rho = -K*T*np.exp(-r*T)*norm.cdf(-d2) / 100
-                theta = (-S*norm.pdf(d1)*sigma/(2*np.sqrt(T)) + r*K*np.exp(-r*T)*norm.cdf(-d2)) / 365
-            
-            gamma = norm.pdf(d1) / (S*sigma*np.sqrt(T))
+            delta, gamma, theta, rho = _greeks_kernel(float(S), K, T, float(r), sigma, is_call)
             
+            # Greeks are display precision, float32 halves their bytes until records are built
             return {
-                'delta': round(delta, 4),
-                'gamma': round(gamma, 4),
-                'theta': round(theta, 4),
-                'rho': round(rho, 4)
+                'delta': delta.astype(np.float32),
+                'gamma': gamma.astype(np.float32),
+                'theta': theta.astype(np.float32),
+                'rho': rho.astype(np.float32)
             }
         except:
-            return {'delta': 0, 'gamma': 0, 'theta': 0, 'rho': 0}
+            return {greek: zeros.copy() for greek in ('delta', 'gamma', 'theta', 'rho')}
     
     
     def get_options_data(self, symbol: str, volume_threshold: int = 100, expiry_filter: str = 'all'):
@@ -95,11 +176,10 @@ class YahooOptionsScanner:
         """
         try:
             ticker = yf.Ticker(symbol)
+            bucket = int(time.time() // QUOTE_CACHE_DURATION)
             
             # Get current stock price and market cap
-            stock_info = ticker.info
-            current_price = stock_info.get('currentPrice') or stock_info.get('regularMarketPrice')
-            market_cap = stock_info.get('marketCap', 0)
+            current_price, market_cap = _get_quote(symbol, bucket)
             
             if not current_price:
                 # Fallback to recent price data
@@ -111,7 +191,7 @@ class YahooOptionsScanner:
                     return []
             
             # Get all expiration dates
-            exp_dates = ticker.options
+            exp_dates = _get_expirations(symbol, bucket)
             if not exp_dates:
                 print(f"No options data available for {symbol}")
                 return []
@@ -122,26 +202,44 @@ class YahooOptionsScanner:
                 print(f"No options data available for {symbol} with filter '{expiry_filter}'")
                 return []
             
+            # Time to expiry for every expiration from one vectorized parse and one clock read,
+            # in the same order as the expiration categories
+            days_to_expiry = (pd.to_datetime(list(filtered_exp_dates), format='%Y-%m-%d') - pd.Timestamp.now()).days
+            times_to_expiry = days_to_expiry.to_numpy() / 365.0
+            
             all_options = []
+            expiration_dtype = pd.CategoricalDtype(filtered_exp_dates)
             total_call_volume = 0
             total_put_volume = 0
             total_call_oi = 0
             total_put_oi = 0
             
+            # Fetch the chains concurrently, each request is network bound
+            fetched_chains = {}
+            with ThreadPoolExecutor(max_workers=min(8, len(filtered_exp_dates))) as executor:
+                futures = {
+                    executor.submit(ticker.option_chain, exp_date): exp_date
+                    for exp_date in filtered_exp_dates
+                }
+                for future in as_completed(futures):
+                    exp_date = futures[future]
+                    try:
+                        fetched_chains[exp_date] = future.result()
+                    except Exception as e:
+                        print(f"Error processing {exp_date} for {symbol}: {e}")
+            
             for exp_date in filtered_exp_dates:
+                if exp_date not in fetched_chains:
+                    continue
+                
                 try:
-                    # Get options chain for this expiration
-                    opt_chain = ticker.option_chain(exp_date)
+                    opt_chain = fetched_chains[exp_date]
                     
-                    # Process calls
+                    # Keep only the columns the results use before filtering and concatenating
                     calls = opt_chain.calls
-                    calls['type'] = 'CALL'
-                    calls['expiration'] = exp_date
-                    
-                    # Process puts
+                    calls = calls[calls.columns.intersection(CHAIN_COLUMNS, sort=False)]
                     puts = opt_chain.puts
-                    puts['type'] = 'PUT'
-                    puts['expiration'] = exp_date
+                    puts = puts[puts.columns.intersection(CHAIN_COLUMNS, sort=False)]
                     
                     # Calculate volume totals for sentiment analysis
                     call_volume = calls['volume'].fillna(0).sum()
@@ -154,25 +252,17 @@ class YahooOptionsScanner:
                     total_call_oi += call_oi
                     total_put_oi += put_oi
                     
-                    # Combine calls and puts
-                    options = pd.concat([calls, puts], ignore_index=True)
-                    
-                    # Filter by volume
-                    options = options[options['volume'] >= volume_threshold]
-                    
-                    if not options.empty:
-                        # Calculate Greeks for each option
-                        for idx, row in options.iterrows():
-                            greeks = self.calculate_greeks(
-                                current_price, row['strike'], (datetime.strptime(exp_date, '%Y-%m-%d') - datetime.now()).days / 365.0, 
-                                self.risk_free_rate, row.get('impliedVolatility', 0.2), row['type']
-                            )
-                            options.at[idx, 'delta'] = greeks['delta']
-                            options.at[idx, 'gamma'] = greeks['gamma']
-                            options.at[idx, 'theta'] = greeks['theta']
-                            options.at[idx, 'rho'] = greeks['rho']
+                    # Filter and tag calls and puts separately; everything is combined
+                    # by the single concat after the loop
+                    for options, option_type in ((calls, 'CALL'), (puts, 'PUT')):
+                        options = options[options['volume'] >= volume_threshold]
+                        if options.empty:
+                            continue
                         
-                        all_options.append(options)
+                        all_options.append(options.assign(
+                            type=pd.Series(option_type, index=options.index, dtype=OPTION_TYPE_DTYPE),
+                            expiration=pd.Series(exp_date, index=options.index, dtype=expiration_dtype)
+                        ))
                         
                 except Exception as e:
                     print(f"Error processing {exp_date} for {symbol}: {e}")
@@ -180,19 +270,38 @@ class YahooOptionsScanner:
             
             if all_options:
                 final_options = pd.concat(all_options, ignore_index=True)
+                
+                # Calculate Greeks for all of the symbol's contracts in one kernel call; each
+                # contract's time to expiry is looked up through its expiration category code
+                greeks = self.calculate_greeks(
+                    current_price, final_options['strike'].to_numpy(dtype=float),
+                    times_to_expiry[final_options['expiration'].cat.codes.to_numpy()],
+                    self.risk_free_rate, final_options.get('impliedVolatility', 0.2),
+                    (final_options['type'] == 'CALL').to_numpy()
+                )
+                final_options = final_options.assign(**greeks)
                 final_options['symbol'] = symbol
                 final_options['current_stock_price'] = current_price
                 
                 # Add market data to each option record
-                for idx in range(len(final_options)):
-                    option_data = final_options.iloc[idx].to_dict()
-                    option_data['market_cap'] = market_cap
-                    option_data['current_price'] = current_price
-                    final_options.iloc[idx] = option_data
+                final_options['market_cap'] = market_cap
+                final_options['current_price'] = current_price
                 
-                # Replace NaN values with None before converting to dict
-                final_options = final_options.fillna(0)
-                return final_options.to_dict('records')
+                # Widen float32 Greeks first so rounded values serialize as clean decimals
+                greek_columns = ['delta', 'gamma', 'theta', 'rho']
+                final_options[greek_columns] = final_options[greek_columns].astype(np.float64).round(4)
+                
+                # Replace NaN values with None before converting to dict; the
+                # categorical columns never hold NaN and reject a 0 fill value
+                final_options = final_options.fillna({
+                    column: 0 for column in final_options.columns if column not in ('type', 'expiration')
+                })
+                
+                # Pull each column out as native Python values once and zip them into
+                # records, skipping to_dict's per-cell boxing
+                columns = final_options.columns.tolist()
+                values = zip(*(final_options[column].tolist() for column in columns))
+                return [dict(zip(columns, row)) for row in values]
             else:
                 return []
                 
@@ -206,18 +315,30 @@ class YahooOptionsScanner:
         print(f"Volume threshold: {volume_threshold}+ contracts")
         print(f"Symbols: {', '.join(self.symbols)}\n")
         
+        return self._scan_symbols(self.symbols, volume_threshold)
+    
+    def _scan_symbols(self, symbols: List[str], volume_threshold: int, expiry_filter: str = 'all') -> List[Dict]:
+        """Scan symbols concurrently, keeping results in input order"""
+        if not symbols:
+            return []
+        
         all_unusual_options = []
         
-        for symbol in self.symbols:
-            try:
-                unusual_options = self.get_options_data(symbol, volume_threshold)
+        # Each symbol is a handful of network round-trips, so overlap them in a thread pool
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+            for unusual_options in executor.map(self._scan_symbol, symbols, repeat(volume_threshold), repeat(expiry_filter)):
                 all_unusual_options.extend(unusual_options)
-            except Exception as e:
-                print(f"{Fore.RED}Error scanning {symbol}: {str(e)}{Style.RESET_ALL}")
-                continue
         
         return all_unusual_options
     
+    def _scan_symbol(self, symbol: str, volume_threshold: int, expiry_filter: str) -> List[Dict]:
+        """Scan one symbol, reporting failures instead of raising"""
+        try:
+            return self.get_options_data(symbol, volume_threshold, expiry_filter)
+        except Exception as e:
+            print(f"{Fore.RED}Error scanning {symbol}: {str(e)}{Style.RESET_ALL}")
+            return []
+    
     def format_results(self, options_data: List[Dict]):
         """Format and display the results in a nice table"""
         if not options_data:
@@ -233,9 +354,8 @@ class YahooOptionsScanner:
         print(f"\n{Fore.GREEN}📊 UNUSUAL OPTIONS ACTIVITY DETECTED{Style.RESET_ALL}")
         print("=" * 140)
         
-        # Group by symbol for better organization
-        for symbol in df['symbol'].unique():
-            symbol_data = df[df['symbol'] == symbol]
+        # Group by symbol for better organization, in one pass over the results
+        for symbol, symbol_data in df.groupby('symbol', sort=False):
             first_row = symbol_data.iloc[0]
             
             # Display sentiment analysis
@@ -248,24 +368,29 @@ class YahooOptionsScanner:
             print(f"{sentiment_color} {Fore.MAGENTA}SENTIMENT: {sentiment_label} ({sentiment_score}/100) | C/P Ratio: {cp_ratio:.2f}{Style.RESET_ALL}")
             print("-" * 120)
             
-            # Create table data
-            table_data = []
-            for _, row in symbol_data.iterrows():
-                table_data.append([
-                    row['expiration'],
-                    f"${row['strike']:.2f}",
-                    row['type'],
-                    f"{row['volume']:,}",
-                    f"{row.get('openInterest', row.get('open_interest', 0)):,}",
-                    f"${row.get('bid', 0):.2f}",
-                    f"${row.get('ask', 0):.2f}",
-                    f"${row.get('lastPrice', row.get('last_price', 0)):.2f}",
-                    f"{row.get('impliedVolatility', row.get('implied_volatility', 0)):.1%}",
-                    f"{row['delta']:.3f}",
-                    f"{row['gamma']:.4f}",
-                    f"{row['theta']:.3f}",
-                    f"{row['rho']:.3f}"
-                ])
+            # Create table data column by column, then zip the columns into rows
+            def column(*names):
+                """Values of the first of the given columns present, or zeros"""
+                for name in names:
+                    if name in symbol_data:
+                        return symbol_data[name].tolist()
+                return [0] * len(symbol_data)
+            
+            table_data = list(zip(
+                column('expiration'),
+                [f"${strike:.2f}" for strike in column('strike')],
+                column('type'),
+                [f"{volume:,}" for volume in column('volume')],
+                [f"{oi:,}" for oi in column('openInterest', 'open_interest')],
+                [f"${bid:.2f}" for bid in column('bid')],
+                [f"${ask:.2f}" for ask in column('ask')],
+                [f"${last:.2f}" for last in column('lastPrice', 'last_price')],
+                [f"{iv:.1%}" for iv in column('impliedVolatility', 'implied_volatility')],
+                [f"{delta:.3f}" for delta in column('delta')],
+                [f"{gamma:.4f}" for gamma in column('gamma')],
+                [f"{theta:.3f}" for theta in column('theta')],
+                [f"{rho:.3f}" for rho in column('rho')]
+            ))
             
             headers = ['Exp', 'Strike', 'Type', 'Volume', 'OI', 'Bid', 'Ask', 'Last', 'IV', 'Δ', 'Γ', 'Θ', 'Ρ']
             
@@ -282,17 +407,7 @@ class YahooOptionsScanner:
         print(f"Expiry filter: {expiry_filter}")
         print(f"Symbols: {', '.join(symbols)}\n")
         
-        all_unusual_options = []
-        
-        for symbol in symbols:
-            try:
-                unusual_options = self.get_options_data(symbol.upper(), volume_threshold, expiry_filter)
-                all_unusual_options.extend(unusual_options)
-            except Exception as e:
-                print(f"{Fore.RED}Error scanning {symbol}: {str(e)}{Style.RESET_ALL}")
-                continue
-        
-        return all_unusual_options
+        return self._scan_symbols([symbol.upper() for symbol in symbols], volume_threshold, expiry_filter)
 
 def main():
     """Main function"""